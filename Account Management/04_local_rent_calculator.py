@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Calculate Rent Exemption Locally
+
+`get_minimum_balance_for_rent_exemption` is a network call, but its answer
+only depends on the account size and the Rent sysvar parameters. Fetch and
+decode the Rent sysvar once, then answer any size (or a whole list of sizes)
+locally.
+"""
+
+import asyncio
+import time
+from solana.rpc.async_api import AsyncClient
+from solders.rent import Rent
+from solders.sysvar import RENT
+
+# Bytes of account metadata charged on top of the data length
+ACCOUNT_STORAGE_OVERHEAD = 128
+
+class RentCalculator:
+    """Answers rent-exemption queries from a cached copy of the Rent sysvar"""
+
+    def __init__(self, rpc, refresh_interval=3600):
+        self.rpc = rpc
+        self.refresh_interval = refresh_interval  # Seconds; rent parameters change very rarely
+        self.rent = None
+        self.fetched_at = 0.0
+
+    async def refresh(self):
+        account_info = await self.rpc.get_account_info(RENT)
+        if account_info.value is None:
+            raise RuntimeError("Rent sysvar account not found")
+        self.rent = Rent.from_bytes(account_info.value.data)
+        self.fetched_at = time.monotonic()
+
+    async def ensure_fresh(self):
+        """Re-fetch the sysvar if the cached copy is older than refresh_interval"""
+        if self.rent is None or time.monotonic() - self.fetched_at > self.refresh_interval:
+            await self.refresh()
+
+    def minimum_balance(self, space):
+        """Minimum lamports for an account of `space` bytes to be rent exempt"""
+        if self.rent is None:
+            raise RuntimeError("RentCalculator has not been loaded")
+        return self.rent.minimum_balance(space)
+
+    def minimum_balances(self, spaces):
+        """Vectorized minimum_balance over a sequence of account sizes"""
+        if self.rent is None:
+            raise RuntimeError("RentCalculator has not been loaded")
+        # Same formula as Rent::minimum_balance, hoisted out of the per-size loop
+        lamports_per_byte_year = self.rent.lamports_per_byte_year
+        exemption_threshold = self.rent.exemption_threshold
+        return [
+            int(((ACCOUNT_STORAGE_OVERHEAD + space) * lamports_per_byte_year) * exemption_threshold)
+            for space in spaces
+        ]
+
+async def main():
+    rpc = AsyncClient("https://api.devnet.solana.com")
+    calculator = RentCalculator(rpc)
+
+    async with rpc:
+        # One network call for the Rent sysvar...
+        await calculator.ensure_fresh()
+
+    # ...then every size is answered locally
+    space = 1500  # bytes
+    lamports = calculator.minimum_balance(space)
+    print(f"Minimum balance for rent exemption: {lamports}")
+    print(f"For account size: {space} bytes")
+    print(f"Cost in SOL: {lamports / 1_000_000_000}")
+
+    # Common sizes: system account, mint, token account, and a 10 KB program account
+    spaces = [0, 82, 165, 10_240]
+    for space, lamports in zip(spaces, calculator.minimum_balances(spaces)):
+        print(f"{space:>6} bytes: {lamports} lamports")
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
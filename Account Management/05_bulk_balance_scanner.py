@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Scan Balances for Many Accounts
+
+Calling `get_balance` once per address does not scale to millions of
+addresses. This scanner reads pubkeys from a file or stdin, fetches them
+with `getMultipleAccounts` in chunks of 100 under bounded concurrency, asks
+for a zero-length `dataSlice` so only lamports come back, and streams the
+results out as CSV or JSONL in input order. Memory stays flat no matter how
+large the input is.
+
+Usage:
+    python 05_bulk_balance_scanner.py pubkeys.txt --format csv > balances.csv
+    cat pubkeys.txt | python 05_bulk_balance_scanner.py --format jsonl
+"""
+
+import argparse
+import asyncio
+import csv
+import itertools
+import json
+import sys
+from solana.exceptions import SolanaRpcException
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import RPCException
+from solana.rpc.types import DataSliceOpts
+from solders.pubkey import Pubkey
+
+# getMultipleAccounts accepts at most 100 pubkeys per call
+MAX_ACCOUNTS_PER_REQUEST = 100
+
+def read_pubkeys(lines):
+    """Parse one base58 pubkey per line, skipping blanks and reporting bad lines"""
+    for line_number, line in enumerate(lines, start=1):
+        address = line.strip()
+        if not address:
+            continue
+        try:
+            yield Pubkey.from_string(address)
+        except ValueError:
+            print(f"Line {line_number}: invalid pubkey {address!r}", file=sys.stderr)
+
+async def fetch_chunk(rpc, pubkeys, retries=3):
+    for attempt in range(retries + 1):
+        try:
+            response = await rpc.get_multiple_accounts(
+                pubkeys,
+                data_slice=DataSliceOpts(offset=0, length=0)  # Lamports only, no account data
+            )
+            break
+        except (SolanaRpcException, RPCException):
+            # Rate limits and timeouts are routine over millions of addresses
+            if attempt == retries:
+                raise
+            await asyncio.sleep(0.5 * 2 ** attempt)
+    return [
+        (pubkey, account.lamports if account is not None else 0, account is not None)
+        for pubkey, account in zip(pubkeys, response.value)
+    ]
+
+async def scan_balances(rpc, pubkeys, concurrency=8):
+    """Yield (pubkey, lamports, exists) in input order with at most `concurrency` requests in flight"""
+    pubkeys = iter(pubkeys)
+    chunks = iter(lambda: list(itertools.islice(pubkeys, MAX_ACCOUNTS_PER_REQUEST)), [])
+    in_flight = []
+
+    try:
+        for chunk in chunks:
+            in_flight.append(asyncio.create_task(fetch_chunk(rpc, chunk)))
+            if len(in_flight) >= concurrency:
+                # Wait on the oldest chunk so output keeps input order
+                for row in await in_flight.pop(0):
+                    yield row
+
+        while in_flight:
+            for row in await in_flight.pop(0):
+                yield row
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+def csv_writer(out):
+    writer = csv.writer(out)
+    writer.writerow(["pubkey", "lamports", "exists"])
+    return lambda pubkey, lamports, exists: writer.writerow([str(pubkey), lamports, int(exists)])
+
+def jsonl_writer(out):
+    def write(pubkey, lamports, exists):
+        out.write(json.dumps({"pubkey": str(pubkey), "lamports": lamports, "exists": exists}) + "\n")
+    return write
+
+async def main():
+    parser = argparse.ArgumentParser(description="Stream SOL balances for many accounts")
+    parser.add_argument("input", nargs="?", help="File with one pubkey per line (default: stdin)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    parser.add_argument("--rpc", default="https://api.devnet.solana.com")
+    args = parser.parse_args()
+
+    source = open(args.input) if args.input else sys.stdin
+    write = csv_writer(sys.stdout) if args.format == "csv" else jsonl_writer(sys.stdout)
+
+    total_accounts = 0
+    total_lamports = 0
+    last_pubkey = None
+
+    async with AsyncClient(args.rpc) as rpc:
+        try:
+            async for pubkey, lamports, exists in scan_balances(rpc, read_pubkeys(source), args.concurrency):
+                write(pubkey, lamports, exists)
+                total_accounts += 1
+                total_lamports += lamports
+                last_pubkey = pubkey
+        except (SolanaRpcException, RPCException) as e:
+            # Output is complete up to and including `last_pubkey`
+            print(f"Scan stopped after {total_accounts} accounts (last: {last_pubkey}): {e!r}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+    print(f"Scanned {total_accounts} accounts, {total_lamports / 1_000_000_000} SOL in total", file=sys.stderr)
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Derive Many PDAs with a Persistent Bump Cache
+
+`Pubkey.find_program_address` searches bumps from 255 downwards, hashing
+and curve-checking each candidate. For millions of PDAs this example
+spreads the search across a process pool and remembers every bump in an
+on-disk SQLite index keyed by (program_id, seeds). Later runs call
+`create_program_address` with the known bump and skip the search.
+
+Run with `--benchmark` to compare cold and warm derivation rates.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from solders.pubkey import Pubkey
+from spl.token.constants import TOKEN_PROGRAM_ID
+
+CHUNK_SIZE = 2_000  # Seed sets per worker task
+LOOKUP_BATCH_SIZE = 500  # Keys per cache query, below SQLite's bound-parameter limit
+
+def encode_seeds(seeds):
+    """Length-prefix each seed so different seed lists never share a key"""
+    return b"".join(len(seed).to_bytes(1, "little") + seed for seed in seeds)
+
+def _find_bumps(program_id_bytes, seed_lists):
+    """Worker: bump search for a chunk of seed lists"""
+    program_id = Pubkey.from_bytes(program_id_bytes)
+    results = []
+    for seeds in seed_lists:
+        pda, bump = Pubkey.find_program_address(seeds, program_id)
+        results.append((bytes(pda), bump))
+    return results
+
+class BumpCache:
+    """On-disk index of known PDA bumps keyed by (program_id, seeds)"""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS bumps ("
+            " program_id BLOB NOT NULL,"
+            " seeds BLOB NOT NULL,"
+            " bump INTEGER NOT NULL,"
+            " PRIMARY KEY (program_id, seeds)"
+            ") WITHOUT ROWID"
+        )
+
+    def get_many(self, program_id, encoded_seeds):
+        program_id_bytes = bytes(program_id)
+        found = {}
+        for i in range(0, len(encoded_seeds), LOOKUP_BATCH_SIZE):
+            batch = encoded_seeds[i:i + LOOKUP_BATCH_SIZE]
+            placeholders = ",".join("?" * len(batch))
+            found.update(self.db.execute(
+                f"SELECT seeds, bump FROM bumps WHERE program_id = ? AND seeds IN ({placeholders})",
+                (program_id_bytes, *batch)
+            ))
+        return [found.get(key) for key in encoded_seeds]
+
+    def put_many(self, program_id, entries):
+        program_id_bytes = bytes(program_id)
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO bumps (program_id, seeds, bump) VALUES (?, ?, ?)",
+                ((program_id_bytes, key, bump) for key, bump in entries)
+            )
+
+    def close(self):
+        self.db.close()
+
+def derive_pdas(program_id, seed_lists, cache=None, executor=None):
+    """Return [(pda, bump)] for every seed list, using cached bumps where possible"""
+    encoded = [encode_seeds(seeds) for seeds in seed_lists]
+    bumps = cache.get_many(program_id, encoded) if cache else [None] * len(seed_lists)
+    results = [None] * len(seed_lists)
+
+    # Warm path: one hash and one curve check per PDA
+    misses = []
+    for i, (seeds, bump) in enumerate(zip(seed_lists, bumps)):
+        if bump is None:
+            misses.append(i)
+        else:
+            results[i] = (Pubkey.create_program_address(seeds + [bytes([bump])], program_id), bump)
+
+    # Cold path: full bump search, spread across the process pool
+    if misses:
+        chunks = [misses[i:i + CHUNK_SIZE] for i in range(0, len(misses), CHUNK_SIZE)]
+        program_id_bytes = bytes(program_id)
+        if executor is not None:
+            futures = [
+                executor.submit(_find_bumps, program_id_bytes, [seed_lists[i] for i in chunk])
+                for chunk in chunks
+            ]
+            chunk_results = [future.result() for future in futures]
+        else:
+            chunk_results = [_find_bumps(program_id_bytes, [seed_lists[i] for i in chunk]) for chunk in chunks]
+
+        found = []
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            for i, (pda_bytes, bump) in zip(chunk, chunk_result):
+                results[i] = (Pubkey.from_bytes(pda_bytes), bump)
+                found.append((encoded[i], bump))
+        if cache:
+            cache.put_many(program_id, found)
+
+    return results
+
+def benchmark(count=100_000):
+    program_id = TOKEN_PROGRAM_ID
+    seed_lists = [[b"vault", i.to_bytes(8, "little")] for i in range(count)]
+
+    with tempfile.TemporaryDirectory() as directory, ProcessPoolExecutor() as executor:
+        cache = BumpCache(os.path.join(directory, "bumps.sqlite"))
+
+        start = time.perf_counter()
+        cold = derive_pdas(program_id, seed_lists, cache, executor)
+        cold_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        warm = derive_pdas(program_id, seed_lists, cache, executor)
+        warm_seconds = time.perf_counter() - start
+
+        cache.close()
+
+    assert cold == warm
+    print(f"PDAs: {count}, workers: {os.cpu_count()}")
+    print(f"Cold (bump search): {cold_seconds:.2f}s, {count / cold_seconds:,.0f} PDAs/s")
+    print(f"Warm (cached bump): {warm_seconds:.2f}s, {count / warm_seconds:,.0f} PDAs/s")
+
+def main():
+    program_id = Pubkey.from_string("11111111111111111111111111111111")
+    seed_lists = [[b"hello", user.encode()] for user in ["alice", "bob", "carol"]]
+
+    cache = BumpCache("pda_bumps.sqlite")
+    with ProcessPoolExecutor() as executor:
+        for seeds, (pda, bump) in zip(seed_lists, derive_pdas(program_id, seed_lists, cache, executor)):
+            print(f"Seeds: {[seed.decode() for seed in seeds]}")
+            print(f"PDA: {pda}")
+            print(f"Bump: {bump}")
+    cache.close()
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Share a Pooled RPC Client Across Endpoints
+
+Every `AsyncClient("https://...")` opens its own HTTP session, so each script
+pays DNS, TCP and TLS setup again. `RpcPool` owns one keep-alive (HTTP/2 when
+`h2` is installed) session for the whole process, tracks a health score and a
+latency EWMA per endpoint, and sends each call to the best endpoint, failing
+over to the next one when a call errors out.
+"""
+
+import asyncio
+import time
+import httpx
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.providers.async_http import AsyncHTTPProvider
+
+try:
+    import h2  # noqa: F401 - only needed for HTTP/2 support in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_ENDPOINTS = [
+    "https://api.devnet.solana.com",
+    "http://localhost:8899",
+]
+
+EWMA_ALPHA = 0.2  # Weight of the newest latency sample
+HEALTH_RECOVERY_SECONDS = 30  # Time for a failed endpoint to regain full health
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class EndpointState:
+    """Health score and latency EWMA of one RPC endpoint"""
+
+    def __init__(self, url):
+        self.url = url
+        self.latency_ewma = None  # Seconds, None until the first request
+        self.health = 1.0  # Health as of the last failure (plus later successes), before recovery
+        self.last_failure = 0.0
+        self.requests = 0
+        self.failures = 0
+
+    def current_health(self):
+        """1.0 is fully healthy, 0.0 is unusable"""
+        # Failed endpoints earn their way back into rotation over HEALTH_RECOVERY_SECONDS
+        recovered = (time.monotonic() - self.last_failure) / HEALTH_RECOVERY_SECONDS
+        return min(1.0, self.health + recovered)
+
+    def score(self):
+        """Lower is better; unmeasured endpoints are tried first until they fail"""
+        health = self.current_health()
+        if self.latency_ewma is None:
+            # Never answered: probe it again only once it has fully recovered from its last failure
+            return 0.0 if health >= 1.0 else float("inf")
+        return self.latency_ewma / max(health, 0.01)
+
+    def update_latency(self, latency):
+        if self.latency_ewma is None:
+            self.latency_ewma = latency
+        else:
+            self.latency_ewma = EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency_ewma
+
+    def record_success(self, latency):
+        self.requests += 1
+        self.update_latency(latency)
+        # Recovery is counted from last_failure, so only the bonus goes into the stored health
+        self.health = min(1.0, self.health + 0.1)
+
+    def record_failure(self):
+        self.requests += 1
+        self.failures += 1
+        # Failures lower health only: a latency penalty in the EWMA would outlast the recovery,
+        # since only requests that reach this endpoint can wash it out again
+        self.health = self.current_health() / 2
+        self.last_failure = time.monotonic()
+
+class RpcPool:
+    """One pooled HTTP session shared by every client, routed per call to the best endpoint"""
+
+    def __init__(
+        self,
+        endpoints=DEFAULT_ENDPOINTS,
+        timeout=10,
+        max_connections=100,
+        max_keepalive_connections=20,
+        keepalive_expiry=30,
+        transport=None
+    ):
+        if not endpoints:
+            raise ValueError("RpcPool needs at least one endpoint")
+        self.endpoints = [EndpointState(url) for url in endpoints]
+        self.session = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry
+            ),
+            transport=transport  # Lets tests and benchmarks plug in a stub server
+        )
+
+    def ranked_endpoints(self):
+        return sorted(self.endpoints, key=lambda endpoint: endpoint.score())
+
+    async def post(self, content, headers):
+        """POST a JSON-RPC payload, failing over across endpoints in score order"""
+        last_error = None
+        for endpoint in self.ranked_endpoints():
+            start = time.perf_counter()
+            try:
+                response = await self.session.post(endpoint.url, content=content, headers=headers)
+            except httpx.TransportError as e:
+                endpoint.record_failure()
+                last_error = e
+                continue
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                endpoint.record_failure()
+                last_error = httpx.HTTPStatusError(
+                    f"{endpoint.url} returned {response.status_code}",
+                    request=response.request,
+                    response=response
+                )
+                continue
+            endpoint.record_success(time.perf_counter() - start)
+            response.raise_for_status()
+            return response.text
+        raise last_error
+
+    def client(self, commitment=None):
+        """Create a lightweight `AsyncClient` that sends through this pool"""
+        return PooledAsyncClient(self, commitment)
+
+    async def close(self):
+        await self.session.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, _exc_type, _exc, _tb):
+        await self.close()
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """`AsyncHTTPProvider` that borrows the pool's session instead of opening its own"""
+
+    def __init__(self, pool, extra_headers=None):
+        # Skip AsyncHTTPProvider.__init__, which would create a private httpx session
+        super(AsyncHTTPProvider, self).__init__(pool.endpoints[0].url, extra_headers)
+        self.pool = pool
+        self.session = pool.session
+
+    def __str__(self):
+        return f"Pooled async HTTP RPC connection to {[e.url for e in self.pool.endpoints]}"
+
+    async def make_request_unparsed(self, body):
+        request_kwargs = self._before_request(body=body)
+        return await self.pool.post(request_kwargs["content"], request_kwargs["headers"])
+
+    async def make_batch_request_unparsed(self, reqs):
+        request_kwargs = self._before_batch_request(reqs)
+        return await self.pool.post(request_kwargs["content"], request_kwargs["headers"])
+
+    async def __aenter__(self):
+        return self
+
+    async def close(self):
+        # The session belongs to the pool; closing one client must not close it for the others
+        pass
+
+class PooledAsyncClient(AsyncClient):
+    """`AsyncClient` backed by a shared `RpcPool`"""
+
+    def __init__(self, pool, commitment=None):
+        # Skip AsyncClient.__init__ so no per-client HTTP session is created
+        super(AsyncClient, self).__init__(commitment)
+        self._provider = PooledHTTPProvider(pool)
+
+_shared_pool = None
+
+def get_shared_pool(endpoints=DEFAULT_ENDPOINTS):
+    """Return the process-wide pool, creating it on first use"""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = RpcPool(endpoints)
+    return _shared_pool
+
+async def close_shared_pool():
+    global _shared_pool
+    if _shared_pool is not None:
+        await _shared_pool.close()
+        _shared_pool = None
+
+async def main():
+    pool = get_shared_pool()
+
+    try:
+        # Clients are cheap: they all reuse the pool's warm connections
+        height_client = pool.client()
+        slot_client = pool.client(commitment="confirmed")
+
+        for _ in range(5):
+            try:
+                slot, block_height = await asyncio.gather(
+                    slot_client.get_slot(),
+                    height_client.get_block_height()
+                )
+                print(f"Slot: {slot.value}, Block height: {block_height.value}")
+            except Exception as e:
+                print(f"All endpoints failed: {e!r}")
+
+        print(f"\nHTTP/2 enabled: {HTTP2_AVAILABLE}")
+        for endpoint in pool.ranked_endpoints():
+            latency = f"{endpoint.latency_ewma * 1000:.1f} ms" if endpoint.latency_ewma else "n/a"
+            print(f"{endpoint.url}: health={endpoint.current_health():.2f}, "
+                  f"latency EWMA={latency}, requests={endpoint.requests}, failures={endpoint.failures}")
+    finally:
+        await close_shared_pool()
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Batch Concurrent RPC Requests
+
+Calls like `get_minimum_balance_for_rent_exemption` and `get_latest_blockhash`
+are independent, yet awaiting them one after the other costs one round trip
+each. `BatchingAsyncClient` collects every request issued in the same
+event-loop tick (or within a configurable microsecond window) into a single
+JSON-RPC array request and hands each caller its own typed response.
+
+Run with `--benchmark` to compare it against a plain `AsyncClient` on a local
+stub RPC server.
+"""
+
+import asyncio
+import json
+import sys
+import time
+from typing import get_args
+import httpx
+from solana.exceptions import SolanaRpcException, handle_async_exceptions
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import RPCException, RPCNoResultException
+from solana.rpc.providers.async_http import AsyncHTTPProvider
+from solders.rpc.responses import RPCError
+
+RPC_ERROR_TYPES = get_args(RPCError)
+
+class BatchingHTTPProvider(AsyncHTTPProvider):
+    """HTTP provider that coalesces concurrent `make_request` calls into JSON-RPC batches"""
+
+    def __init__(
+        self,
+        endpoint=None,
+        extra_headers=None,
+        timeout=10,
+        window_us=0,
+        max_batch_size=100,
+        transport=None
+    ):
+        # Skip AsyncHTTPProvider.__init__ so the session can take a custom transport
+        super(AsyncHTTPProvider, self).__init__(endpoint, extra_headers)
+        self.session = httpx.AsyncClient(timeout=timeout, transport=transport)
+        self.window = window_us / 1_000_000
+        self.max_batch_size = max_batch_size
+        self._pending = []
+        self._flush_handle = None
+        self._in_flight = set()
+        self.round_trips = 0
+        self.requests = 0
+
+    @handle_async_exceptions(SolanaRpcException, httpx.HTTPError)
+    async def make_request(self, body, parser):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((body, parser, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            # call_soon runs after every task that is already ready this tick
+            if self.window:
+                self._flush_handle = loop.call_later(self.window, self._flush)
+            else:
+                self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._send_batch(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _send_batch(self, batch):
+        self.round_trips += 1
+        self.requests += len(batch)
+
+        # solders bodies all carry id 0, so renumber them to match responses by id
+        payload = []
+        for request_id, (body, _parser, _future) in enumerate(batch):
+            request = json.loads(body.to_json())
+            request["id"] = request_id
+            payload.append(request)
+
+        try:
+            response = await self.session.post(
+                **self._build_common_request_kwargs(),
+                content=json.dumps(payload)
+            )
+            response.raise_for_status()
+            results = response.json()
+            if not isinstance(results, list):
+                # A single error object means the whole batch was rejected
+                raise RPCException(results.get("error", results))
+        except Exception as e:
+            for _body, _parser, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        try:
+            results_by_id = {result.get("id"): result for result in results}
+            for request_id, (body, parser, future) in enumerate(batch):
+                if future.done():
+                    continue  # Caller was cancelled
+                result = results_by_id.get(request_id)
+                if result is None:
+                    future.set_exception(RPCNoResultException(f"No response for {body.__class__.__name__}"))
+                    continue
+                try:
+                    parsed = parser.from_json(json.dumps(result))
+                except Exception as e:
+                    # A malformed element fails only its own caller
+                    future.set_exception(e)
+                    continue
+                if isinstance(parsed, RPC_ERROR_TYPES):
+                    future.set_exception(RPCException(parsed))
+                else:
+                    future.set_result(parsed)
+        finally:
+            # Never leave a caller waiting forever, whatever went wrong above
+            for body, _parser, future in batch:
+                if not future.done():
+                    future.set_exception(RPCNoResultException(f"No response for {body.__class__.__name__}"))
+
+    async def close(self):
+        if self._pending:
+            self._flush()
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        await self.session.aclose()
+
+class BatchingAsyncClient(AsyncClient):
+    """`AsyncClient` whose concurrent calls share one HTTP round trip"""
+
+    def __init__(
+        self,
+        endpoint=None,
+        commitment=None,
+        timeout=10,
+        extra_headers=None,
+        window_us=0,
+        max_batch_size=100,
+        transport=None
+    ):
+        # Skip AsyncClient.__init__, which would build a regular provider
+        super(AsyncClient, self).__init__(commitment)
+        self._provider = BatchingHTTPProvider(
+            endpoint,
+            extra_headers=extra_headers,
+            timeout=timeout,
+            window_us=window_us,
+            max_batch_size=max_batch_size,
+            transport=transport
+        )
+
+def stub_rpc_transport(stats, latency=0.02):
+    """Local stub RPC server: answers single and batch requests after a fixed round-trip delay"""
+
+    def respond(request):
+        if request["method"] == "getMinimumBalanceForRentExemption":
+            result = 2039280
+        else:
+            result = {
+                "context": {"slot": 1},
+                "value": {"blockhash": "EkSnNWid2cvwEVnVx9aBqawnmiCNiDgp3gUdkDPTKN1N", "lastValidBlockHeight": 1000}
+            }
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+    async def handler(http_request):
+        stats["round_trips"] += 1
+        await asyncio.sleep(latency)
+        payload = json.loads(http_request.content)
+        if isinstance(payload, list):
+            return httpx.Response(200, json=[respond(request) for request in payload])
+        return httpx.Response(200, json=respond(payload))
+
+    return httpx.MockTransport(handler)
+
+async def run_callers(client, callers):
+    async def caller():
+        # The same two calls the account-creation examples make back to back
+        await asyncio.gather(
+            client.get_minimum_balance_for_rent_exemption(165),
+            client.get_latest_blockhash()
+        )
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    return time.perf_counter() - start
+
+async def benchmark():
+    print(f"{'callers':>8} {'mode':>9} {'round trips':>12} {'seconds':>8} {'calls/s':>10}")
+    for callers in (1, 10, 1000):
+        for mode in ("plain", "batched"):
+            stats = {"round_trips": 0}
+            transport = stub_rpc_transport(stats)
+            if mode == "plain":
+                client = AsyncClient("http://stub.local")
+                client._provider.session = httpx.AsyncClient(transport=transport)
+            else:
+                client = BatchingAsyncClient("http://stub.local", transport=transport)
+            async with client:
+                elapsed = await run_callers(client, callers)
+            calls = callers * 2
+            print(f"{callers:>8} {mode:>9} {stats['round_trips']:>12} {elapsed:>8.3f} {calls / elapsed:>10.0f}")
+
+async def main():
+    rpc = BatchingAsyncClient("https://api.devnet.solana.com")
+
+    async with rpc:
+        # Both requests go out in one JSON-RPC batch
+        rent_lamports, recent_blockhash = await asyncio.gather(
+            rpc.get_minimum_balance_for_rent_exemption(0),
+            rpc.get_latest_blockhash()
+        )
+
+        print(f"Rent Lamports: {rent_lamports.value}")
+        print(f"Blockhash: {recent_blockhash.value.blockhash}")
+        print(f"Requests: {rpc._provider.requests}, round trips: {rpc._provider.round_trips}")
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        asyncio.run(benchmark())
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Multiplex Many Account Subscriptions
+
+One websocket per subscription does not scale to tens of thousands of
+accounts. `SubscriptionManager` spreads `accountSubscribe` streams across a
+small pool of websocket connections, routes each notification by
+subscription id to a bounded per-consumer queue, and re-subscribes
+everything automatically after a reconnect.
+"""
+
+import asyncio
+import itertools
+import websockets
+from solana.rpc.core import _ACCOUNT_ENCODING_TO_SOLDERS, _COMMITMENT_TO_SOLDERS
+from solana.rpc.websocket_api import connect, SubscriptionError
+from solders.keypair import Keypair
+from solders.rpc.config import RpcAccountInfoConfig
+from solders.rpc.requests import AccountSubscribe, AccountUnsubscribe
+from solders.rpc.responses import (
+    AccountNotification, AccountNotificationJsonParsed, SubscriptionResult, UnsubscribeResult
+)
+
+# What to do when a consumer's queue is full
+DROP_OLDEST = "drop_oldest"  # Discard the oldest queued notification
+BLOCK = "block"  # Wait for the consumer (stalls every stream on that connection)
+LATEST = "latest"  # Keep only the newest notification
+
+MAX_RECONNECT_DELAY_SECONDS = 30
+
+class Subscription:
+    """One consumer's account stream and its bounded notification queue"""
+
+    def __init__(self, pubkey, commitment=None, encoding=None, maxsize=100, overflow=DROP_OLDEST):
+        if overflow not in (DROP_OLDEST, BLOCK, LATEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.pubkey = pubkey
+        self.commitment = commitment
+        self.encoding = encoding
+        self.overflow = overflow
+        self.queue = asyncio.Queue(maxsize=1 if overflow == LATEST else maxsize)
+        self.connection = None
+        self.subscription_id = None  # Assigned by the server, changes on every reconnect
+        self.error = None
+        self.dropped = 0
+
+    def request(self, request_id):
+        commitment = None if self.commitment is None else _COMMITMENT_TO_SOLDERS[self.commitment]
+        encoding = None if self.encoding is None else _ACCOUNT_ENCODING_TO_SOLDERS[self.encoding]
+        config = None
+        if commitment is not None or encoding is not None:
+            config = RpcAccountInfoConfig(encoding=encoding, commitment=commitment)
+        return AccountSubscribe(self.pubkey, config, request_id)
+
+    async def deliver(self, notification):
+        if self.overflow == BLOCK:
+            await self.queue.put(notification)
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(notification)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.queue.get()
+
+class _Connection:
+    """One websocket carrying many subscriptions"""
+
+    def __init__(self, uri):
+        self.uri = uri
+        self.subscriptions = set()
+        self.websocket = None
+        self.pending = {}  # request id -> Subscription awaiting its subscription id
+        self.routes = {}  # subscription id -> Subscription
+        self.request_ids = itertools.count(1)
+        self.connected = asyncio.Event()
+
+    async def subscribe(self, subscription):
+        self.subscriptions.add(subscription)
+        if self.websocket is not None:
+            await self._send_subscribe(subscription)
+
+    async def unsubscribe(self, subscription):
+        self.subscriptions.discard(subscription)
+        subscription_id = subscription.subscription_id
+        subscription.subscription_id = None
+        if subscription_id is not None:
+            self.routes.pop(subscription_id, None)
+            if self.websocket is not None:
+                await self.websocket.send_data(AccountUnsubscribe(subscription_id, next(self.request_ids)))
+
+    async def _send_subscribe(self, subscription):
+        request_id = next(self.request_ids)
+        self.pending[request_id] = subscription
+        await self.websocket.send_data(subscription.request(request_id))
+
+    async def run(self):
+        delay = 1
+        while True:
+            try:
+                async with connect(self.uri) as websocket:
+                    self.websocket = websocket
+                    delay = 1
+                    # Subscription ids do not survive a reconnect: start from scratch
+                    self.pending.clear()
+                    self.routes.clear()
+                    for subscription in list(self.subscriptions):
+                        await self._send_subscribe(subscription)
+                    self.connected.set()
+                    await self._read(websocket)
+            except (websockets.ConnectionClosed, websockets.InvalidHandshake, OSError) as e:
+                # InvalidHandshake covers rejected reconnects, e.g. HTTP 429
+                print(f"{self.uri} disconnected ({e!r}), reconnecting in {delay}s")
+            finally:
+                self.websocket = None
+                self.connected.clear()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_RECONNECT_DELAY_SECONDS)
+
+    async def _read(self, websocket):
+        while True:
+            try:
+                messages = await websocket.recv()
+            except SubscriptionError as e:
+                subscription = self.pending.pop(e.subscription.id, None)
+                if subscription is not None:
+                    subscription.error = e
+                continue
+            for message in messages:
+                if isinstance(message, SubscriptionResult):
+                    subscription = self.pending.pop(message.id, None)
+                    if subscription is None:
+                        continue
+                    if subscription in self.subscriptions:
+                        subscription.subscription_id = message.result
+                        self.routes[message.result] = subscription
+                    else:
+                        # Unsubscribed before the server answered
+                        await websocket.send_data(AccountUnsubscribe(message.result, next(self.request_ids)))
+                    continue
+                if isinstance(message, UnsubscribeResult):
+                    continue  # Acknowledgement of an unsubscribe
+                if not isinstance(message, (AccountNotification, AccountNotificationJsonParsed)):
+                    continue
+                subscription = self.routes.get(message.subscription)
+                if subscription is not None:
+                    await subscription.deliver(message.result)
+
+class SubscriptionManager:
+    """Spreads account subscriptions across a small pool of websocket connections"""
+
+    def __init__(self, uri="wss://api.devnet.solana.com", connections=4):
+        self.connections = [_Connection(uri) for _ in range(connections)]
+        self._tasks = []
+
+    async def start(self):
+        self._tasks = [asyncio.create_task(connection.run()) for connection in self.connections]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def wait_connected(self):
+        await asyncio.gather(*(connection.connected.wait() for connection in self.connections))
+
+    async def account_subscribe(
+        self,
+        pubkey,
+        commitment=None,
+        encoding=None,
+        maxsize=100,
+        overflow=DROP_OLDEST
+    ):
+        subscription = Subscription(pubkey, commitment, encoding, maxsize, overflow)
+        # Least-loaded connection keeps streams evenly spread
+        connection = min(self.connections, key=lambda c: len(c.subscriptions))
+        subscription.connection = connection
+        await connection.subscribe(subscription)
+        return subscription
+
+    async def unsubscribe(self, subscription):
+        await subscription.connection.unsubscribe(subscription)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, _exc_type, _exc, _tb):
+        await self.stop()
+
+async def main():
+    accounts = [Keypair().pubkey() for _ in range(1000)]
+
+    async with SubscriptionManager("wss://api.devnet.solana.com", connections=4) as manager:
+        subscriptions = [
+            await manager.account_subscribe(pubkey, commitment="confirmed", overflow=LATEST)
+            for pubkey in accounts
+        ]
+
+        await manager.wait_connected()
+        for connection in manager.connections:
+            print(f"Connection carries {len(connection.subscriptions)} subscriptions")
+
+        # Each consumer reads only its own stream
+        async def consume(subscription):
+            notification = await subscription.get()
+            print(f"{subscription.pubkey}: {notification.value.lamports} lamports")
+
+        consumers = [asyncio.create_task(consume(s)) for s in subscriptions]
+        await asyncio.wait(consumers, timeout=30)
+        for consumer in consumers:
+            consumer.cancel()
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
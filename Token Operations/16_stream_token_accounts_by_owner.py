@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Stream Token Accounts for Many Owners
+
+`10_get_all_token_accounts_by_owner.py` fetches one owner and holds the whole
+response. For portfolios spanning hundreds of thousands of wallets, this
+fetcher takes an iterable of owners, keeps a bounded number of
+`get_token_accounts_by_owner` calls in flight, and yields one compact
+`TokenHolding` per token account as each owner's response arrives.
+
+Each call asks for base64 data with a 72-byte `dataSlice` (mint, owner and
+amount, the start of every token account) and decodes it locally with
+`struct`, instead of paying for jsonParsed on the node and in Python.
+
+Usage:
+    python 16_stream_token_accounts_by_owner.py owners.txt > holdings.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import struct
+import sys
+from typing import NamedTuple
+from solana.exceptions import SolanaRpcException
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import RPCException
+from solana.rpc.types import DataSliceOpts, TokenAccountOpts
+from solders.pubkey import Pubkey
+from spl.token.constants import TOKEN_PROGRAM_ID
+
+# mint, owner, amount: the first 72 bytes of every token account
+HOLDING_PREFIX = struct.Struct("<32s32sQ")
+
+class TokenHolding(NamedTuple):
+    owner: Pubkey
+    account: Pubkey
+    mint: Pubkey
+    amount: int
+
+def read_pubkeys(lines):
+    """Parse one base58 pubkey per line, skipping blanks and reporting bad lines"""
+    for line_number, line in enumerate(lines, start=1):
+        address = line.strip()
+        if not address:
+            continue
+        try:
+            yield Pubkey.from_string(address)
+        except ValueError:
+            print(f"Line {line_number}: invalid pubkey {address!r}", file=sys.stderr)
+
+async def fetch_holdings(rpc, owner, program_id=TOKEN_PROGRAM_ID, retries=2):
+    """Fetch and decode every token account of one owner"""
+    opts = TokenAccountOpts(
+        program_id=program_id,
+        encoding="base64",
+        data_slice=DataSliceOpts(offset=0, length=HOLDING_PREFIX.size)
+    )
+    for attempt in range(retries + 1):
+        try:
+            response = await rpc.get_token_accounts_by_owner(owner, opts)
+            break
+        except (SolanaRpcException, RPCException):
+            if attempt == retries:
+                raise
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+    holdings = []
+    for keyed_account in response.value:
+        mint, _owner, amount = HOLDING_PREFIX.unpack_from(keyed_account.account.data)
+        holdings.append(TokenHolding(owner, keyed_account.pubkey, Pubkey.from_bytes(mint), amount))
+    return holdings
+
+async def stream_token_accounts(rpc, owners, concurrency=16, program_id=TOKEN_PROGRAM_ID):
+    """Yield a `TokenHolding` per token account, with at most `concurrency` owners in flight"""
+    owners = iter(owners)
+    in_flight = {}  # Task -> owner
+
+    try:
+        while True:
+            # Top up from the owner iterator; it is never read ahead further than this
+            for owner in owners:
+                in_flight[asyncio.create_task(fetch_holdings(rpc, owner, program_id))] = owner
+                if len(in_flight) >= concurrency:
+                    break
+            if not in_flight:
+                return
+
+            # Yield whichever owners finish first; completion order, not input order
+            done, _pending = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                owner = in_flight.pop(task)
+                try:
+                    holdings = task.result()
+                except (SolanaRpcException, RPCException) as e:
+                    # Failed after retries: report and skip rather than end a stream of many owners
+                    print(f"Skipping owner {owner}: {e!r}", file=sys.stderr)
+                    continue
+                for holding in holdings:
+                    yield holding
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+async def main():
+    parser = argparse.ArgumentParser(description="Stream token accounts for many owners as JSONL")
+    parser.add_argument("input", nargs="?", help="File with one owner pubkey per line (default: stdin)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Owners in flight")
+    parser.add_argument("--skip-empty", action="store_true", help="Omit token accounts with a zero balance")
+    parser.add_argument("--rpc", default="https://api.devnet.solana.com")
+    args = parser.parse_args()
+
+    source = open(args.input) if args.input else sys.stdin
+    total_accounts = 0
+
+    async with AsyncClient(args.rpc) as rpc:
+        try:
+            async for holding in stream_token_accounts(rpc, read_pubkeys(source), args.concurrency):
+                if args.skip_empty and holding.amount == 0:
+                    continue
+                sys.stdout.write(json.dumps({
+                    "owner": str(holding.owner),
+                    "account": str(holding.account),
+                    "mint": str(holding.mint),
+                    "amount": holding.amount
+                }) + "\n")
+                total_accounts += 1
+        finally:
+            if source is not sys.stdin:
+                source.close()
+
+    print(f"Streamed {total_accounts} token accounts", file=sys.stderr)
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
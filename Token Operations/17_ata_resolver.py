@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Resolve Associated Token Addresses in Bulk
+
+Every `get_associated_token_address` call repeats the PDA bump search, even
+for (owner, mint) pairs seen a moment ago. `AtaResolver` keeps a bounded LRU
+of derived addresses keyed by (owner, mint, token_program), and its bulk
+`get_many` derives the misses for a whole list of owners of one mint across
+a process pool.
+
+Run with `--benchmark` to compare uncached, cold and warm derivation rates.
+"""
+
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from solders.pubkey import Pubkey
+from spl.token.constants import ASSOCIATED_TOKEN_PROGRAM_ID, TOKEN_PROGRAM_ID
+from spl.token.instructions import get_associated_token_address
+
+CHUNK_SIZE = 2_000  # Owners per worker task
+
+def _derive_atas(mint_bytes, token_program_bytes, owner_bytes_list):
+    """Worker: bump search for a chunk of owners of one mint"""
+    seeds_tail = [token_program_bytes, mint_bytes]
+    results = []
+    for owner_bytes in owner_bytes_list:
+        ata, _bump = Pubkey.find_program_address([owner_bytes] + seeds_tail, ASSOCIATED_TOKEN_PROGRAM_ID)
+        results.append(bytes(ata))
+    return results
+
+class AtaResolver:
+    """Associated token address lookups with a bounded LRU cache"""
+
+    def __init__(self, maxsize=500_000):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()  # (owner, mint, token_program) -> address, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key, address):
+        self._cache[key] = address
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    def get(self, owner, mint, token_program_id=TOKEN_PROGRAM_ID):
+        """Return the associated token address, deriving it only on a cache miss"""
+        key = (owner, mint, token_program_id)
+        address = self._cache.get(key)
+        if address is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return address
+        self.misses += 1
+        address = get_associated_token_address(owner, mint, token_program_id)
+        self._remember(key, address)
+        return address
+
+    def get_many(self, owners, mint, token_program_id=TOKEN_PROGRAM_ID, executor=None):
+        """Return the associated token addresses of `owners` for one mint, in input order"""
+        results = [None] * len(owners)
+        missing = []
+        for i, owner in enumerate(owners):
+            key = (owner, mint, token_program_id)
+            address = self._cache.get(key)
+            if address is None:
+                missing.append(i)
+            else:
+                self._cache.move_to_end(key)
+                results[i] = address
+        self.hits += len(owners) - len(missing)
+        self.misses += len(missing)
+
+        if not missing:
+            return results
+
+        # Cold path: bump search for the misses, spread across the process pool
+        chunks = [missing[i:i + CHUNK_SIZE] for i in range(0, len(missing), CHUNK_SIZE)]
+        args = [(bytes(mint), bytes(token_program_id), [bytes(owners[i]) for i in chunk]) for chunk in chunks]
+        if executor is not None:
+            futures = [executor.submit(_derive_atas, *chunk_args) for chunk_args in args]
+            chunk_results = [future.result() for future in futures]
+        else:
+            chunk_results = [_derive_atas(*chunk_args) for chunk_args in args]
+
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            for i, address_bytes in zip(chunk, chunk_result):
+                address = Pubkey.from_bytes(address_bytes)
+                results[i] = address
+                self._remember((owners[i], mint, token_program_id), address)
+        return results
+
+    def __len__(self):
+        return len(self._cache)
+
+def benchmark(count=100_000):
+    mint = Pubkey.from_string("4zMMC9srt5Ri5X14GAgXhaHii3GnPAEERYPJgZJDncDU")
+    owners = [Pubkey.new_unique() for _ in range(count)]
+    resolver = AtaResolver()
+
+    start = time.perf_counter()
+    uncached = [get_associated_token_address(owner, mint) for owner in owners]
+    uncached_seconds = time.perf_counter() - start
+
+    with ProcessPoolExecutor() as executor:
+        start = time.perf_counter()
+        cold = resolver.get_many(owners, mint, executor=executor)
+        cold_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    warm = resolver.get_many(owners, mint)
+    warm_seconds = time.perf_counter() - start
+
+    assert uncached == cold == warm
+    print(f"ATAs: {count}, workers: {os.cpu_count()}")
+    print(f"Uncached get_associated_token_address: {count / uncached_seconds:,.0f} ATAs/s")
+    print(f"Cold get_many (process pool): {count / cold_seconds:,.0f} ATAs/s")
+    print(f"Warm get_many (LRU hits): {count / warm_seconds:,.0f} ATAs/s")
+
+def main():
+    resolver = AtaResolver()
+
+    # Example mint (USDC on devnet) and payout recipients
+    mint_address = Pubkey.from_string("4zMMC9srt5Ri5X14GAgXhaHii3GnPAEERYPJgZJDncDU")
+    owners = [Pubkey.new_unique() for _ in range(5)]
+
+    with ProcessPoolExecutor() as executor:
+        for owner, ata in zip(owners, resolver.get_many(owners, mint_address, executor=executor)):
+            print(f"Owner: {owner} -> ATA: {ata}")
+
+    # Repeat lookups skip the bump search
+    ata = resolver.get(owners[0], mint_address)
+    print(f"Cached ATA: {ata}")
+    print(f"Hits: {resolver.hits}, misses: {resolver.misses}")
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Airdrop or Mint Tokens to Many Recipients
+
+Sending one `transfer_checked` per transaction turns a 100k-recipient
+airdrop into 100k transactions. This engine reads (recipient, amount) rows
+for one mint, finds which associated token accounts are missing with
+chunked `getMultipleAccounts`, and packs idempotent ATA creations and
+`transfer_checked` instructions into as few `MessageV0` transactions as fit
+under the 1232-byte packet limit and the compute budget.
+
+Transactions then flow through a build -> sign -> send -> confirm pipeline:
+a background task keeps the blockhash fresh, sender tasks keep a bounded
+number of transactions unconfirmed, and one confirmer polls
+`getSignatureStatuses` in chunks of 256, rebroadcasting pending
+transactions and rebuilding batches whose blockhash expired.
+
+With `--mode mint` the same pipeline distributes newly minted tokens
+(e.g. epoch rewards): `--keypair` is the mint authority and each row becomes
+a `mint_to_checked` instead of a transfer.
+
+Every sent and confirmed transaction is appended to a checkpoint file.
+Rerunning with the same CSV and checkpoint first settles transactions
+whose outcome was unknown at the crash, then sends only rows that are not
+confirmed yet, so no recipient is paid twice.
+
+Usage:
+    python 18_token_airdrop.py recipients.csv --mint <MINT> --keypair sender.json
+    python 18_token_airdrop.py rewards.csv --mint <MINT> --keypair mint_authority.json --mode mint
+    python 18_token_airdrop.py --benchmark     # against a local validator stand-in
+
+The CSV holds `recipient,amount` rows, with amounts in whole tokens
+(e.g. `1.5`); a header row is optional.
+"""
+
+import argparse
+import asyncio
+import base64
+import csv
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal, InvalidOperation
+import httpx
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import _COMMITMENT_TO_SOLDERS
+from solana.rpc.types import DataSliceOpts, TxOpts
+from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0, to_bytes_versioned
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.transaction import VersionedTransaction
+from spl.token.constants import TOKEN_PROGRAM_ID
+from spl.token.instructions import (
+    create_idempotent_associated_token_account,
+    get_associated_token_address,
+    mint_to_checked,
+    MintToCheckedParams,
+    transfer_checked,
+    TransferCheckedParams
+)
+
+PACKET_DATA_SIZE = 1232  # Maximum serialized transaction size in bytes
+MAX_COMPUTE_UNITS = 1_400_000  # Per-transaction compute limit
+TRANSFER_CHECKED_COMPUTE_UNITS = 6_500
+MINT_TO_CHECKED_COMPUTE_UNITS = 4_500
+CREATE_ATA_COMPUTE_UNITS = 30_000
+COMPUTE_UNIT_MARGIN = 1.1
+
+MAX_ACCOUNTS_PER_REQUEST = 100  # getMultipleAccounts limit
+MAX_SIGNATURES_PER_REQUEST = 256  # getSignatureStatuses limit
+MINT_DECIMALS_OFFSET = 44  # mint_authority_option (4) + mint_authority (32) + supply (8)
+
+BLOCKHASH_REFRESH_SECONDS = 2.0
+REBROADCAST_SECONDS = 2.0
+MAX_ATTEMPTS = 5  # Blockhash expiries before a batch is given up as failed
+
+class Batch:
+    """Instructions for one transaction and the CSV rows they pay"""
+
+    def __init__(self, rows, instructions, compute_units):
+        self.rows = rows
+        self.instructions = instructions
+        self.compute_units = compute_units
+        self.expiries = 0
+
+def transaction_size(message, num_signers):
+    # Compact-u16 signature count, the signatures, then the versioned message
+    return 1 + 64 * num_signers + len(to_bytes_versioned(message))
+
+def compile_batch(payer, instructions, compute_units, compute_unit_price, recent_blockhash):
+    budget = [set_compute_unit_limit(int(compute_units * COMPUTE_UNIT_MARGIN))]
+    if compute_unit_price:
+        budget.append(set_compute_unit_price(compute_unit_price))
+    return MessageV0.try_compile(
+        payer=payer,
+        instructions=budget + instructions,
+        address_lookup_table_accounts=[],
+        recent_blockhash=recent_blockhash
+    )
+
+def pack_instructions(groups, payer, num_signers, compute_unit_price=0):
+    """Greedily pack (row, instructions, compute_units) groups into as few batches as fit"""
+    placeholder_blockhash = Hash.default()
+    batches = []
+    rows, instructions, compute_units = [], [], 0
+
+    for row, group_instructions, group_compute_units in groups:
+        if instructions:
+            candidate_units = compute_units + group_compute_units
+            fits = int(candidate_units * COMPUTE_UNIT_MARGIN) <= MAX_COMPUTE_UNITS
+            if fits:
+                message = compile_batch(
+                    payer, instructions + group_instructions, candidate_units,
+                    compute_unit_price, placeholder_blockhash
+                )
+                fits = transaction_size(message, num_signers) <= PACKET_DATA_SIZE
+            if fits:
+                rows.append(row)
+                instructions += group_instructions
+                compute_units = candidate_units
+                continue
+            batches.append(Batch(rows, instructions, compute_units))
+        rows, instructions, compute_units = [row], list(group_instructions), group_compute_units
+
+    if instructions:
+        batches.append(Batch(rows, instructions, compute_units))
+    return batches
+
+def read_recipients(path, decimals):
+    """Read `recipient,amount` rows and convert amounts to base units"""
+    recipients = []
+    with open(path, newline="") as source:
+        for line_number, row in enumerate(csv.reader(source), start=1):
+            if not row or not row[0].strip():
+                continue
+            try:
+                amount = Decimal(row[1].strip())
+            except (IndexError, InvalidOperation):
+                if line_number == 1:
+                    continue  # Header row
+                raise ValueError(f"Line {line_number}: invalid amount in {row!r}")
+            base_units = amount.scaleb(decimals)
+            if base_units != base_units.to_integral_value() or base_units <= 0:
+                raise ValueError(f"Line {line_number}: {amount} is not a positive amount with {decimals} decimals")
+            recipients.append((Pubkey.from_string(row[0].strip()), int(base_units)))
+    return recipients
+
+async def fetch_mint_decimals(rpc, mint):
+    response = await rpc.get_account_info(mint)
+    if response.value is None:
+        raise ValueError(f"Mint {mint} not found")
+    return response.value.data[MINT_DECIMALS_OFFSET]
+
+async def find_missing_accounts(rpc, addresses, concurrency=8):
+    """Return the subset of `addresses` that do not exist yet"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_chunk(chunk):
+        async with semaphore:
+            response = await rpc.get_multiple_accounts(chunk, data_slice=DataSliceOpts(offset=0, length=0))
+        return [address for address, account in zip(chunk, response.value) if account is None]
+
+    chunks = [addresses[i:i + MAX_ACCOUNTS_PER_REQUEST] for i in range(0, len(addresses), MAX_ACCOUNTS_PER_REQUEST)]
+    missing = set()
+    for chunk_missing in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+        missing.update(chunk_missing)
+    return missing
+
+def recipients_digest(recipients):
+    digest = hashlib.sha256()
+    for recipient, amount in recipients:
+        digest.update(bytes(recipient) + amount.to_bytes(8, "little"))
+    return digest.hexdigest()
+
+class _SentTransaction:
+    def __init__(self, batch, wire_transaction, last_valid_block_height):
+        self.batch = batch
+        self.wire_transaction = wire_transaction
+        self.last_valid_block_height = last_valid_block_height
+        self.sent_at = time.monotonic()
+
+class AirdropEngine:
+    """Packs, signs, sends and confirms token transfers or mints with a resumable checkpoint"""
+
+    def __init__(
+        self,
+        rpc,
+        payer,
+        sender,
+        mint,
+        checkpoint_path,
+        concurrency=32,
+        max_unconfirmed=256,
+        compute_unit_price=0,
+        poll_interval=1.0,
+        mode="transfer"
+    ):
+        if mode not in ("transfer", "mint"):
+            raise ValueError(f"Unknown mode {mode!r}")
+        self.rpc = rpc
+        self.payer = payer
+        self.sender = sender  # Token owner, or the mint authority in "mint" mode
+        self.mode = mode
+        self.mint = mint
+        self.checkpoint_path = checkpoint_path
+        self.concurrency = concurrency
+        self.max_unconfirmed = max_unconfirmed
+        self.compute_unit_price = compute_unit_price
+        self.poll_interval = poll_interval
+        self.signers = [payer] if payer.pubkey() == sender.pubkey() else [payer, sender]
+        self.confirmed_rank = int(_COMMITMENT_TO_SOLDERS["confirmed"])
+        self.blockhash = None
+        self.last_valid_block_height = None
+        self.stats = {"transactions": 0, "confirmed": 0, "failed": 0, "expired": 0}
+        self._checkpoint = None
+
+    def _record(self, event):
+        self._checkpoint.write(json.dumps(event) + "\n")
+        self._checkpoint.flush()
+
+    def _load_checkpoint(self, digest):
+        """Return (confirmed rows, {signature: (rows, last_valid_block_height)} still in doubt)"""
+        confirmed_rows = set()
+        in_doubt = {}
+        if not os.path.exists(self.checkpoint_path):
+            return confirmed_rows, in_doubt
+        with open(self.checkpoint_path) as checkpoint:
+            for line in checkpoint:
+                event = json.loads(line)
+                if event["event"] == "start":
+                    if event["digest"] != digest:
+                        raise ValueError("Checkpoint belongs to a different recipient list")
+                    # Checkpoints from before mint mode existed are transfers
+                    mode = event.get("mode", "transfer")
+                    if mode != self.mode:
+                        raise ValueError(f"Checkpoint was written in {mode!r} mode")
+                elif event["event"] == "sent":
+                    in_doubt[event["signature"]] = (event["rows"], event["last_valid_block_height"])
+                elif event["event"] == "confirmed":
+                    confirmed_rows.update(in_doubt.pop(event["signature"])[0])
+                else:  # failed or expired: the rows were not paid
+                    in_doubt.pop(event["signature"], None)
+        return confirmed_rows, in_doubt
+
+    async def _check_statuses(self, pending):
+        """Sort pending signatures into confirmed, failed and expired"""
+        signatures = list(pending)
+        chunks = [
+            signatures[i:i + MAX_SIGNATURES_PER_REQUEST]
+            for i in range(0, len(signatures), MAX_SIGNATURES_PER_REQUEST)
+        ]
+        responses = await asyncio.gather(
+            *(self.rpc.get_signature_statuses([Signature.from_string(s) for s in chunk]) for chunk in chunks),
+            self.rpc.get_block_height()
+        )
+        block_height = responses[-1].value
+        statuses = [status for response in responses[:-1] for status in response.value]
+
+        confirmed, failed, expired = [], [], []
+        for signature, status in zip(signatures, statuses):
+            if status is not None and status.err is not None:
+                failed.append((signature, str(status.err)))
+            elif status is not None and status.confirmation_status is not None \
+                    and int(status.confirmation_status) >= self.confirmed_rank:
+                confirmed.append(signature)
+            elif status is None and block_height > pending[signature]:
+                # The blockhash has expired, so this transaction can never land
+                expired.append(signature)
+        return confirmed, failed, expired
+
+    async def _settle_in_doubt(self, in_doubt, confirmed_rows):
+        """Wait for transactions sent before a crash to land or expire"""
+        while in_doubt:
+            pending = {signature: height for signature, (_rows, height) in in_doubt.items()}
+            confirmed, failed, expired = await self._check_statuses(pending)
+            for signature in confirmed:
+                confirmed_rows.update(in_doubt.pop(signature)[0])
+                self._record({"event": "confirmed", "signature": signature})
+            for signature, error in failed:
+                del in_doubt[signature]
+                self._record({"event": "failed", "signature": signature, "error": error})
+            for signature in expired:
+                del in_doubt[signature]
+                self._record({"event": "expired", "signature": signature})
+            if in_doubt:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _build_batches(self, recipients, rows):
+        decimals = await fetch_mint_decimals(self.rpc, self.mint)
+        source = get_associated_token_address(self.sender.pubkey(), self.mint) if self.mode == "transfer" else None
+        atas = {recipient: get_associated_token_address(recipient, self.mint) for recipient, _amount in recipients}
+        missing = await find_missing_accounts(self.rpc, list({atas[recipients[row][0]] for row in rows}))
+
+        groups = []
+        for row in rows:
+            recipient, amount = recipients[row]
+            destination = atas[recipient]
+            instructions = []
+            compute_units = 0
+            if destination in missing:
+                # Every row for a missing account creates it: rows of one recipient can land in
+                # different, concurrently sent batches. Idempotent, so repeats are harmless
+                instructions.append(
+                    create_idempotent_associated_token_account(self.payer.pubkey(), recipient, self.mint)
+                )
+                compute_units += CREATE_ATA_COMPUTE_UNITS
+            if self.mode == "mint":
+                instructions.append(
+                    mint_to_checked(
+                        MintToCheckedParams(
+                            program_id=TOKEN_PROGRAM_ID,
+                            mint=self.mint,
+                            dest=destination,
+                            mint_authority=self.sender.pubkey(),
+                            amount=amount,
+                            decimals=decimals
+                        )
+                    )
+                )
+                compute_units += MINT_TO_CHECKED_COMPUTE_UNITS
+            else:
+                instructions.append(
+                    transfer_checked(
+                        TransferCheckedParams(
+                            program_id=TOKEN_PROGRAM_ID,
+                            source=source,
+                            mint=self.mint,
+                            dest=destination,
+                            owner=self.sender.pubkey(),
+                            amount=amount,
+                            decimals=decimals
+                        )
+                    )
+                )
+                compute_units += TRANSFER_CHECKED_COMPUTE_UNITS
+            groups.append((row, instructions, compute_units))
+
+        return pack_instructions(groups, self.payer.pubkey(), len(self.signers), self.compute_unit_price)
+
+    async def _refresh_blockhash(self):
+        response = await self.rpc.get_latest_blockhash()
+        self.blockhash = response.value.blockhash
+        self.last_valid_block_height = response.value.last_valid_block_height
+
+    async def _blockhash_loop(self):
+        while True:
+            await asyncio.sleep(BLOCKHASH_REFRESH_SECONDS)
+            try:
+                await self._refresh_blockhash()
+            except Exception as e:
+                print(f"Blockhash refresh failed: {e!r}")
+
+    async def _builder(self):
+        while True:
+            batch = await self._build_queue.get()
+            message = compile_batch(
+                self.payer.pubkey(), batch.instructions, batch.compute_units,
+                self.compute_unit_price, self.blockhash
+            )
+            transaction = VersionedTransaction(message, self.signers)
+            await self._send_queue.put((batch, transaction, self.last_valid_block_height))
+
+    async def _sender(self):
+        while True:
+            batch, transaction, last_valid_block_height = await self._send_queue.get()
+            await self._unconfirmed.acquire()
+            signature = str(transaction.signatures[0])
+            # Record before sending: if we crash mid-send, the resumed run checks this signature
+            self._record({
+                "event": "sent",
+                "signature": signature,
+                "rows": batch.rows,
+                "last_valid_block_height": last_valid_block_height
+            })
+            wire_transaction = bytes(transaction)
+            self._pending[signature] = _SentTransaction(batch, wire_transaction, last_valid_block_height)
+            self.stats["transactions"] += 1
+            try:
+                await self.rpc.send_raw_transaction(wire_transaction, TxOpts(skip_preflight=True))
+            except Exception as e:
+                # The confirmer rebroadcasts it, or rebuilds it once the blockhash expires
+                print(f"Send failed for {signature}: {e!r}")
+
+    def _resolve(self, signature):
+        sent = self._pending.pop(signature)
+        self._unconfirmed.release()
+        return sent
+
+    async def _confirmer(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if not self._pending:
+                continue
+            try:
+                confirmed, failed, expired = await self._check_statuses(
+                    {signature: sent.last_valid_block_height for signature, sent in self._pending.items()}
+                )
+            except Exception as e:
+                print(f"Signature status poll failed: {e!r}")
+                continue
+
+            for signature in confirmed:
+                sent = self._resolve(signature)
+                self._record({"event": "confirmed", "signature": signature})
+                self.stats["confirmed"] += len(sent.batch.rows)
+                self._remaining -= 1
+            for signature, error in failed:
+                sent = self._resolve(signature)
+                self._record({"event": "failed", "signature": signature, "error": error})
+                self.stats["failed"] += len(sent.batch.rows)
+                self._remaining -= 1
+            for signature in expired:
+                sent = self._resolve(signature)
+                self._record({"event": "expired", "signature": signature})
+                self.stats["expired"] += 1
+                sent.batch.expiries += 1
+                if sent.batch.expiries < MAX_ATTEMPTS:
+                    self._build_queue.put_nowait(sent.batch)
+                else:
+                    # Keeps expiring (e.g. the fee payer is out of SOL); rerun to retry these rows
+                    print(f"Giving up on {len(sent.batch.rows)} rows after {MAX_ATTEMPTS} expired attempts")
+                    self.stats["failed"] += len(sent.batch.rows)
+                    self._remaining -= 1
+
+            # Leaders drop transactions under load; resend until they land or expire
+            now = time.monotonic()
+            stale = [sent for sent in self._pending.values() if now - sent.sent_at > REBROADCAST_SECONDS]
+            for sent in stale:
+                sent.sent_at = now
+            await asyncio.gather(
+                *(self.rpc.send_raw_transaction(sent.wire_transaction, TxOpts(skip_preflight=True)) for sent in stale),
+                return_exceptions=True
+            )
+
+            if self._remaining == 0:
+                self._finished.set()
+
+    async def run(self, recipients):
+        """Pay every (recipient, base units) row not yet confirmed in the checkpoint"""
+        is_new = not os.path.exists(self.checkpoint_path)
+        digest = recipients_digest(recipients)
+        confirmed_rows, in_doubt = self._load_checkpoint(digest)
+        self._checkpoint = open(self.checkpoint_path, "a")
+        tasks = []
+        try:
+            if is_new:
+                self._record({"event": "start", "digest": digest, "mode": self.mode})
+            if in_doubt:
+                print(f"Settling {len(in_doubt)} transactions from the previous run")
+                await self._settle_in_doubt(in_doubt, confirmed_rows)
+
+            rows = [row for row in range(len(recipients)) if row not in confirmed_rows]
+            print(f"{len(confirmed_rows)} rows already confirmed, {len(rows)} to send")
+            if not rows:
+                return self.stats
+
+            batches = await self._build_batches(recipients, rows)
+            print(f"Packed {len(rows)} {self.mode}s into {len(batches)} transactions")
+
+            self._build_queue = asyncio.Queue()
+            for batch in batches:
+                self._build_queue.put_nowait(batch)
+            self._send_queue = asyncio.Queue(maxsize=self.concurrency)
+            self._pending = {}  # Signature -> _SentTransaction
+            self._unconfirmed = asyncio.Semaphore(self.max_unconfirmed)
+            self._remaining = len(batches)
+            self._finished = asyncio.Event()
+
+            await self._refresh_blockhash()
+            tasks.append(asyncio.create_task(self._blockhash_loop()))
+            tasks.append(asyncio.create_task(self._builder()))
+            tasks.extend(asyncio.create_task(self._sender()) for _ in range(self.concurrency))
+            tasks.append(asyncio.create_task(self._confirmer()))
+            await self._finished.wait()
+            return self.stats
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._checkpoint.close()
+
+def local_validator_transport(stats, existing_accounts=(), decimals=6, latency=0.002, slot_seconds=0.4):
+    """Local validator stand-in: lands every transaction in the next block and confirms it one block later"""
+    started = time.monotonic()
+    landed = {}  # Signature -> block height it landed in
+    mint_data = bytes(MINT_DECIMALS_OFFSET) + bytes([decimals, 1]) + bytes(36)
+
+    def block_height():
+        return 1_000 + int((time.monotonic() - started) / slot_seconds)
+
+    def respond(method, params):
+        height = block_height()
+        context = {"slot": height}
+        if method == "getAccountInfo":
+            return {"context": context, "value": {
+                "data": [base64.b64encode(mint_data).decode(), "base64"], "executable": False,
+                "lamports": 1_461_600, "owner": str(TOKEN_PROGRAM_ID), "rentEpoch": 0, "space": len(mint_data)
+            }}
+        if method == "getMultipleAccounts":
+            return {"context": context, "value": [
+                {"data": ["", "base64"], "executable": False, "lamports": 2_039_280,
+                 "owner": str(TOKEN_PROGRAM_ID), "rentEpoch": 0, "space": 165}
+                if address in existing_accounts else None
+                for address in params[0]
+            ]}
+        if method == "getLatestBlockhash":
+            blockhash = Hash(hashlib.sha256(height.to_bytes(8, "little")).digest())
+            return {"context": context, "value": {"blockhash": str(blockhash), "lastValidBlockHeight": height + 150}}
+        if method == "sendTransaction":
+            raw = base64.b64decode(params[0])
+            if len(raw) > PACKET_DATA_SIZE:
+                raise ValueError(f"Transaction too large: {len(raw)} bytes")
+            signature = str(VersionedTransaction.from_bytes(raw).signatures[0])
+            landed.setdefault(signature, height + 1)
+            stats["transactions"] += 1
+            return signature
+        if method == "getSignatureStatuses":
+            return {"context": context, "value": [
+                {"slot": landed[signature], "confirmations": None, "err": None, "status": {"Ok": None},
+                 "confirmationStatus": "confirmed"}
+                if signature in landed and height > landed[signature] else None
+                for signature in params[0]
+            ]}
+        if method == "getBlockHeight":
+            return height
+        raise ValueError(f"Unsupported method {method}")
+
+    async def handler(http_request):
+        stats["round_trips"] += 1
+        await asyncio.sleep(latency)
+        request = json.loads(http_request.content)
+        return httpx.Response(200, json={
+            "jsonrpc": "2.0", "id": request["id"], "result": respond(request["method"], request.get("params", []))
+        })
+
+    return httpx.MockTransport(handler)
+
+async def benchmark(count=50_000):
+    """Mint rewards to `count` accounts, half of which need an ATA, against the local stand-in"""
+    mint = Pubkey.new_unique()
+    mint_authority = Keypair()
+    recipients = [(Keypair().pubkey(), 1_000_000 + i) for i in range(count)]
+    existing_accounts = {
+        str(get_associated_token_address(recipient, mint)) for recipient, _amount in recipients[::2]
+    }
+    stats = {"round_trips": 0, "transactions": 0}
+
+    with tempfile.TemporaryDirectory() as directory:
+        rpc = AsyncClient("http://validator.local")
+        rpc._provider.session = httpx.AsyncClient(transport=local_validator_transport(stats, existing_accounts))
+        async with rpc:
+            engine = AirdropEngine(
+                rpc, mint_authority, mint_authority, mint, os.path.join(directory, "rewards.checkpoint.jsonl"),
+                poll_interval=0.4, mode="mint"
+            )
+            start = time.perf_counter()
+            result = await engine.run(recipients)
+            elapsed = time.perf_counter() - start
+
+    print(f"Recipients: {result['confirmed']}, transactions: {result['transactions']}, RPC calls: {stats['round_trips']}")
+    print(f"Elapsed: {elapsed:.1f}s, {result['confirmed'] / elapsed:,.0f} recipients/s, "
+          f"{result['transactions'] / elapsed:,.1f} transactions/s")
+
+def load_keypair(path):
+    with open(path) as keypair_file:
+        return Keypair.from_json(keypair_file.read())
+
+async def main():
+    parser = argparse.ArgumentParser(description="Airdrop one SPL token to many recipients")
+    parser.add_argument("recipients", help="CSV file of recipient,amount rows")
+    parser.add_argument("--mint", required=True, help="Mint address of the token to send")
+    parser.add_argument("--keypair", required=True, help="Token owner (or mint authority with --mode mint) keypair JSON file")
+    parser.add_argument("--mode", choices=["transfer", "mint"], default="transfer")
+    parser.add_argument("--fee-payer", help="Fee payer keypair JSON file (default: --keypair)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <recipients>.checkpoint.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=32, help="Transactions sent in parallel")
+    parser.add_argument("--priority-fee", type=int, default=0, help="Compute unit price in micro-lamports")
+    parser.add_argument("--rpc", default="https://api.devnet.solana.com")
+    args = parser.parse_args()
+
+    sender = load_keypair(args.keypair)
+    payer = load_keypair(args.fee_payer) if args.fee_payer else sender
+    mint = Pubkey.from_string(args.mint)
+    checkpoint_path = args.checkpoint or args.recipients + ".checkpoint.jsonl"
+
+    async with AsyncClient(args.rpc) as rpc:
+        decimals = await fetch_mint_decimals(rpc, mint)
+        recipients = read_recipients(args.recipients, decimals)
+        print(f"Recipients: {len(recipients)}, mint: {mint}, decimals: {decimals}")
+
+        engine = AirdropEngine(
+            rpc, payer, sender, mint, checkpoint_path,
+            concurrency=args.concurrency,
+            compute_unit_price=args.priority_fee,
+            mode=args.mode
+        )
+        start = time.perf_counter()
+        stats = await engine.run(recipients)
+        elapsed = time.perf_counter() - start
+
+    print(f"Transactions sent: {stats['transactions']} ({stats['expired']} expired)")
+    print(f"Recipients paid: {stats['confirmed']}, failed: {stats['failed']}")
+    print(f"Elapsed: {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        asyncio.run(benchmark())
+    else:
+        asyncio.run(main())
\ No newline at end of file
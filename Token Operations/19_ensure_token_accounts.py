@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Make Sure Many Token Accounts Exist
+
+Sending `create_associated_token_account` for every user costs a
+transaction per user and fails for users who already have the account.
+`ensure_atas` checks a list of (owner, mint) pairs with chunked
+`getMultipleAccounts`, builds the idempotent creation instruction only for
+the accounts that are missing, and packs those into as few transactions as
+fit under the 1232-byte packet limit. Onboarding thousands of users costs
+a handful of RPC calls and transactions.
+"""
+
+import asyncio
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import _COMMITMENT_TO_SOLDERS, TransactionExpiredBlockheightExceededError
+from solana.rpc.types import DataSliceOpts, TxOpts
+from solders.compute_budget import set_compute_unit_limit
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0, to_bytes_versioned
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+from spl.token.constants import TOKEN_PROGRAM_ID
+from spl.token.instructions import create_idempotent_associated_token_account, get_associated_token_address
+
+PACKET_DATA_SIZE = 1232  # Maximum serialized transaction size in bytes
+MAX_COMPUTE_UNITS = 1_400_000  # Per-transaction compute limit
+CREATE_ATA_COMPUTE_UNITS = 30_000
+
+MAX_ACCOUNTS_PER_REQUEST = 100  # getMultipleAccounts limit
+MAX_SIGNATURES_PER_REQUEST = 256  # getSignatureStatuses limit
+
+def transaction_size(message, num_signers):
+    # Compact-u16 signature count, the signatures, then the versioned message
+    return 1 + 64 * num_signers + len(to_bytes_versioned(message))
+
+def compile_creations(payer, instructions, recent_blockhash):
+    compute_budget = set_compute_unit_limit(CREATE_ATA_COMPUTE_UNITS * len(instructions))
+    return MessageV0.try_compile(
+        payer=payer,
+        instructions=[compute_budget] + instructions,
+        address_lookup_table_accounts=[],
+        recent_blockhash=recent_blockhash
+    )
+
+async def find_missing_atas(rpc, pairs, token_program_id=TOKEN_PROGRAM_ID, concurrency=8):
+    """Return [(owner, mint, ata)] for every distinct pair whose ATA does not exist yet"""
+    atas = {}
+    for owner, mint in pairs:
+        atas.setdefault((owner, mint), get_associated_token_address(owner, mint, token_program_id))
+    keys = list(atas)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_chunk(chunk):
+        async with semaphore:
+            response = await rpc.get_multiple_accounts(
+                [atas[key] for key in chunk],
+                data_slice=DataSliceOpts(offset=0, length=0)  # Existence only, no account data
+            )
+        return [(owner, mint, atas[owner, mint]) for (owner, mint), account in zip(chunk, response.value) if account is None]
+
+    chunks = [keys[i:i + MAX_ACCOUNTS_PER_REQUEST] for i in range(0, len(keys), MAX_ACCOUNTS_PER_REQUEST)]
+    missing = []
+    for chunk_missing in await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks)):
+        missing.extend(chunk_missing)
+    return missing
+
+def pack_creations(payer, missing, token_program_id=TOKEN_PROGRAM_ID):
+    """Pack idempotent ATA creations into as few instruction lists as fit in a transaction"""
+    placeholder_blockhash = Hash.default()
+    batches = []
+    batch = []
+    for owner, mint, _ata in missing:
+        instruction = create_idempotent_associated_token_account(payer, owner, mint, token_program_id)
+        if batch:
+            candidate = batch + [instruction]
+            fits = CREATE_ATA_COMPUTE_UNITS * len(candidate) <= MAX_COMPUTE_UNITS and transaction_size(
+                compile_creations(payer, candidate, placeholder_blockhash), 1
+            ) <= PACKET_DATA_SIZE
+            if fits:
+                batch = candidate
+                continue
+            batches.append(batch)
+        batch = [instruction]
+    if batch:
+        batches.append(batch)
+    return batches
+
+async def send_and_confirm(rpc, payer, batches, concurrency=16, poll_interval=1.0, commitment="confirmed"):
+    """Sign and send every batch under one blockhash, then confirm them with batched status polls"""
+    latest_blockhash = await rpc.get_latest_blockhash()
+    recent_blockhash = latest_blockhash.value.blockhash
+    last_valid_block_height = latest_blockhash.value.last_valid_block_height
+
+    transactions = [
+        VersionedTransaction(compile_creations(payer.pubkey(), batch, recent_blockhash), [payer])
+        for batch in batches
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(transaction):
+        async with semaphore:
+            await rpc.send_raw_transaction(bytes(transaction), TxOpts(skip_preflight=True))
+        return transaction.signatures[0]
+
+    pending = set(await asyncio.gather(*(send(transaction) for transaction in transactions)))
+    signatures = [transaction.signatures[0] for transaction in transactions]
+    commitment_rank = int(_COMMITMENT_TO_SOLDERS[commitment])
+    errors = {}
+
+    while pending:
+        await asyncio.sleep(poll_interval)
+        chunk_list = list(pending)
+        chunks = [
+            chunk_list[i:i + MAX_SIGNATURES_PER_REQUEST]
+            for i in range(0, len(chunk_list), MAX_SIGNATURES_PER_REQUEST)
+        ]
+        responses = await asyncio.gather(
+            *(rpc.get_signature_statuses(chunk) for chunk in chunks),
+            rpc.get_block_height()
+        )
+        block_height = responses[-1].value
+        statuses = [status for response in responses[:-1] for status in response.value]
+        for signature, status in zip(chunk_list, statuses):
+            if status is None or status.confirmation_status is None:
+                continue
+            if status.err is not None:
+                errors[signature] = status.err
+                pending.discard(signature)
+            elif int(status.confirmation_status) >= commitment_rank:
+                pending.discard(signature)
+        if pending and block_height > last_valid_block_height:
+            raise TransactionExpiredBlockheightExceededError(
+                f"{len(pending)} ATA creation transactions expired; run ensure_atas again to retry them"
+            )
+
+    return signatures, errors
+
+async def ensure_atas(rpc, payer, pairs, token_program_id=TOKEN_PROGRAM_ID, concurrency=16):
+    """Create whichever associated token accounts in `pairs` are missing; return the ones created"""
+    missing = await find_missing_atas(rpc, pairs, token_program_id)
+    if not missing:
+        return []
+    batches = pack_creations(payer.pubkey(), missing, token_program_id)
+    _signatures, errors = await send_and_confirm(rpc, payer, batches, concurrency)
+    if errors:
+        raise RuntimeError(f"{len(errors)} of {len(batches)} ATA creation transactions failed: {errors}")
+    return [ata for _owner, _mint, ata in missing]
+
+async def main():
+    rpc = AsyncClient("https://api.devnet.solana.com")
+
+    payer = Keypair()
+
+    # Example mint (USDC on devnet) and a batch of new users
+    mint_address = Pubkey.from_string("4zMMC9srt5Ri5X14GAgXhaHii3GnPAEERYPJgZJDncDU")
+    owners = [Keypair().pubkey() for _ in range(1_000)]
+    pairs = [(owner, mint_address) for owner in owners]
+
+    async with rpc:
+        # One getMultipleAccounts call per 100 pairs
+        missing = await find_missing_atas(rpc, pairs)
+        batches = pack_creations(payer.pubkey(), missing)
+
+        print(f"Pairs checked: {len(pairs)}")
+        print(f"Missing token accounts: {len(missing)}")
+        print(f"Transactions needed: {len(batches)} (up to {max(map(len, batches), default=0)} accounts each)")
+
+        # With a funded payer, this creates them all:
+        # created = await ensure_atas(rpc, payer, pairs)
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
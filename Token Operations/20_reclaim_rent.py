@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Reclaim Rent from Empty Token Accounts
+
+Every token account holds about 0.002 SOL of rent, and wallets that trade
+many tokens collect empty "dust" accounts. This sweeper lists an owner's
+token accounts in one `get_token_accounts_by_owner` call with base64 data,
+decodes them locally to find zero-balance, non-native accounts the owner
+may close, packs `close_account` instructions into as few transactions as
+fit under the 1232-byte limit, and reports the lamports recovered.
+"""
+
+import asyncio
+import struct
+import time
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import _COMMITMENT_TO_SOLDERS
+from solana.rpc.types import TokenAccountOpts, TxOpts
+from solders.compute_budget import set_compute_unit_limit
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0, to_bytes_versioned
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+from spl.token.constants import TOKEN_PROGRAM_ID
+from spl.token.instructions import close_account, CloseAccountParams
+
+PACKET_DATA_SIZE = 1232  # Maximum serialized transaction size in bytes
+CLOSE_ACCOUNT_COMPUTE_UNITS = 3_000
+MAX_SIGNATURES_PER_REQUEST = 256  # getSignatureStatuses limit
+REBROADCAST_SECONDS = 2.0  # Resend unconfirmed transactions this often until their blockhash expires
+MAX_ATTEMPTS = 3  # Rebuilds with a fresh blockhash after an expiry
+
+# mint, owner, amount, delegate_option, delegate, state, is_native_option,
+# is_native, delegated_amount, close_authority_option, close_authority
+TOKEN_ACCOUNT_STRUCT = struct.Struct("<32s32sQI32sBIQQI32s")
+FROZEN = 2
+
+def is_reclaimable(data, owner):
+    """True for a zero-balance, non-native, unfrozen account that `owner` may close"""
+    (
+        _mint, _owner, amount, _delegate_option, _delegate, state, is_native_option,
+        _is_native, _delegated_amount, close_authority_option, close_authority
+    ) = TOKEN_ACCOUNT_STRUCT.unpack_from(data)
+    if amount != 0 or is_native_option or state == FROZEN:
+        return False
+    return not close_authority_option or close_authority == bytes(owner)
+
+async def find_empty_accounts(rpc, owner, program_id=TOKEN_PROGRAM_ID):
+    """Return [(token_account, lamports)] for every empty account `owner` can close"""
+    response = await rpc.get_token_accounts_by_owner(
+        owner,
+        TokenAccountOpts(program_id=program_id, encoding="base64")
+    )
+    return [
+        (keyed_account.pubkey, keyed_account.account.lamports)
+        for keyed_account in response.value
+        if is_reclaimable(keyed_account.account.data, owner)
+    ]
+
+def transaction_size(message, num_signers):
+    # Compact-u16 signature count, the signatures, then the versioned message
+    return 1 + 64 * num_signers + len(to_bytes_versioned(message))
+
+def compile_closes(payer, instructions, recent_blockhash):
+    compute_budget = set_compute_unit_limit(CLOSE_ACCOUNT_COMPUTE_UNITS * len(instructions))
+    return MessageV0.try_compile(
+        payer=payer,
+        instructions=[compute_budget] + instructions,
+        address_lookup_table_accounts=[],
+        recent_blockhash=recent_blockhash
+    )
+
+def pack_closes(payer, owner, destination, accounts, program_id=TOKEN_PROGRAM_ID):
+    """Pack close_account instructions into batches of (instructions, lamports reclaimed)"""
+    num_signers = 1 if payer == owner else 2
+    placeholder_blockhash = Hash.default()
+    batches = []
+    instructions, lamports = [], 0
+
+    for token_account, account_lamports in accounts:
+        instruction = close_account(
+            CloseAccountParams(
+                program_id=program_id,
+                account=token_account,
+                dest=destination,
+                owner=owner
+            )
+        )
+        if instructions:
+            message = compile_closes(payer, instructions + [instruction], placeholder_blockhash)
+            if transaction_size(message, num_signers) <= PACKET_DATA_SIZE:
+                instructions.append(instruction)
+                lamports += account_lamports
+                continue
+            batches.append((instructions, lamports))
+        instructions, lamports = [instruction], account_lamports
+
+    if instructions:
+        batches.append((instructions, lamports))
+    return batches
+
+async def send_and_confirm(
+    rpc,
+    transactions,
+    last_valid_block_height,
+    concurrency=16,
+    poll_interval=1.0,
+    commitment="confirmed"
+):
+    """Send signed transactions and return {signature: None, the error, or "expired"} once each is final"""
+    semaphore = asyncio.Semaphore(concurrency)
+    by_signature = {transaction.signatures[0]: transaction for transaction in transactions}
+
+    async def send(transaction):
+        async with semaphore:
+            try:
+                await rpc.send_raw_transaction(bytes(transaction), TxOpts(skip_preflight=True))
+            except Exception as e:
+                # Left pending: rebroadcast later, or expired with the blockhash
+                print(f"Send failed for {transaction.signatures[0]}: {e!r}")
+
+    await asyncio.gather(*(send(transaction) for transaction in transactions))
+
+    pending = list(by_signature)
+    commitment_rank = int(_COMMITMENT_TO_SOLDERS[commitment])
+    results = {}
+    last_broadcast = time.monotonic()
+
+    while pending:
+        await asyncio.sleep(poll_interval)
+        chunks = [pending[i:i + MAX_SIGNATURES_PER_REQUEST] for i in range(0, len(pending), MAX_SIGNATURES_PER_REQUEST)]
+        responses = await asyncio.gather(
+            *(rpc.get_signature_statuses(chunk) for chunk in chunks),
+            rpc.get_block_height()
+        )
+        block_height = responses[-1].value
+        statuses = [status for response in responses[:-1] for status in response.value]
+        still_pending = []
+        for signature, status in zip(pending, statuses):
+            if status is not None and status.err is not None:
+                results[signature] = status.err
+            elif status is not None and status.confirmation_status is not None \
+                    and int(status.confirmation_status) >= commitment_rank:
+                results[signature] = None
+            elif status is None and block_height > last_valid_block_height:
+                results[signature] = "expired"
+            else:
+                still_pending.append(signature)
+        pending = still_pending
+
+        if pending and time.monotonic() - last_broadcast >= REBROADCAST_SECONDS:
+            # With skip_preflight a dropped packet is never retried by the node
+            await asyncio.gather(*(send(by_signature[signature]) for signature in pending))
+            last_broadcast = time.monotonic()
+    return results
+
+async def sweep_empty_accounts(rpc, owner, destination=None, payer=None, program_id=TOKEN_PROGRAM_ID):
+    """Close every empty token account of `owner`; return (accounts closed, lamports recovered)"""
+    payer = payer or owner
+    destination = destination or owner.pubkey()
+    accounts = await find_empty_accounts(rpc, owner.pubkey(), program_id)
+    if not accounts:
+        return 0, 0
+
+    batches = pack_closes(payer.pubkey(), owner.pubkey(), destination, accounts, program_id)
+    signers = [payer] if payer.pubkey() == owner.pubkey() else [payer, owner]
+    closed = 0
+    recovered = 0
+
+    for attempt in range(MAX_ATTEMPTS):
+        latest_blockhash = await rpc.get_latest_blockhash()
+        transactions = [
+            VersionedTransaction(
+                compile_closes(payer.pubkey(), instructions, latest_blockhash.value.blockhash),
+                signers
+            )
+            for instructions, _lamports in batches
+        ]
+        results = await send_and_confirm(rpc, transactions, latest_blockhash.value.last_valid_block_height)
+
+        expired = []
+        for transaction, (instructions, lamports) in zip(transactions, batches):
+            signature = transaction.signatures[0]
+            if results[signature] is None:
+                closed += len(instructions)
+                recovered += lamports
+            elif results[signature] == "expired":
+                # Never landed, so it is safe to rebuild with a fresh blockhash
+                expired.append((instructions, lamports))
+            else:
+                print(f"Close transaction {signature} failed: {results[signature]}")
+        batches = expired
+        if not batches:
+            break
+    if batches:
+        print(f"{len(batches)} close transactions expired {MAX_ATTEMPTS} times; run the sweep again to retry them")
+    return closed, recovered
+
+async def main():
+    rpc = AsyncClient("https://api.devnet.solana.com")
+
+    # Hot wallet to sweep; reclaimed rent goes to a treasury
+    owner = Keypair()
+    treasury = Pubkey.from_string("AC5RDfQFmDS1deWZos921JfqscXdByf8BKHs5ACWjtW2")
+
+    async with rpc:
+        accounts = await find_empty_accounts(rpc, owner.pubkey())
+        batches = pack_closes(owner.pubkey(), owner.pubkey(), treasury, accounts)
+        print(f"Owner: {owner.pubkey()}")
+        print(f"Empty token accounts: {len(accounts)}")
+        print(f"Close transactions needed: {len(batches)}")
+        print(f"Reclaimable rent: {sum(lamports for _account, lamports in accounts) / 1e9} SOL")
+
+        if accounts:
+            closed, recovered = await sweep_empty_accounts(rpc, owner, treasury)
+            print(f"Closed {closed} accounts, recovered {recovered} lamports ({recovered / 1e9} SOL)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Keep a Pool of Wrapped SOL Accounts
+
+`14_wrapped_sol.py` creates, funds, syncs and closes a wrapped SOL account
+around every use, which costs instructions and rent churn on every trade.
+`WrappedSolPool` keeps a fixed set of long-lived wrapped SOL accounts
+derived with `create_account_with_seed` (so they are found again after a
+restart), tracks their balances locally, and hands out one account per
+concurrent task so parallel swaps never write to the same account.
+
+Accounts that drop below a low-water mark are topped up together in one
+packed transaction, and `sync_native` is only sent for accounts whose
+lamports were changed outside the token program.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.types import TxOpts
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0, to_bytes_versioned
+from solders.pubkey import Pubkey
+from solders.system_program import create_account_with_seed, CreateAccountWithSeedParams, transfer, TransferParams
+from solders.transaction import VersionedTransaction
+from spl.token.constants import TOKEN_PROGRAM_ID, WRAPPED_SOL_MINT
+from spl.token.instructions import (
+    close_account, CloseAccountParams,
+    initialize_account, InitializeAccountParams,
+    sync_native, SyncNativeParams
+)
+
+PACKET_DATA_SIZE = 1232  # Maximum serialized transaction size in bytes
+TOKEN_ACCOUNT_SIZE = 165
+AMOUNT_OFFSET = 64  # mint (32) + owner (32)
+MAX_ACCOUNTS_PER_REQUEST = 100  # getMultipleAccounts limit
+MAX_TOP_UP_ATTEMPTS = 5  # Retries, with doubling delays, before a top-up is given up
+
+class PooledWsolAccount:
+    """One wrapped SOL account; `balance` is its token amount, tracked locally"""
+
+    def __init__(self, address, seed):
+        self.address = address
+        self.seed = seed
+        self.balance = 0
+        self.needs_sync = False
+
+    def record_native_deposit(self, lamports):
+        """Note lamports sent straight to the account; they count once `sync_native` runs"""
+        self.balance += lamports
+        self.needs_sync = True
+
+    def sync_instructions(self):
+        """Return [sync_native] if the account has unsynced lamports, else []"""
+        if not self.needs_sync:
+            return []
+        self.needs_sync = False
+        return [sync_native(SyncNativeParams(program_id=TOKEN_PROGRAM_ID, account=self.address))]
+
+class WrappedSolPool:
+    """Long-lived wrapped SOL accounts handed out one task at a time"""
+
+    def __init__(
+        self,
+        rpc,
+        owner,
+        size=8,
+        target_balance=1_000_000_000,
+        low_balance=250_000_000,
+        seed_prefix="wsol-pool",
+        top_up_delay=0.2
+    ):
+        self.rpc = rpc
+        self.owner = owner
+        self.target_balance = target_balance
+        self.low_balance = low_balance
+        self.top_up_delay = top_up_delay  # Window for coalescing top-ups into one transaction
+        self.accounts = [
+            PooledWsolAccount(
+                Pubkey.create_with_seed(owner.pubkey(), f"{seed_prefix}-{i}", TOKEN_PROGRAM_ID),
+                f"{seed_prefix}-{i}"
+            )
+            for i in range(size)
+        ]
+        self.rent_exempt_reserve = None
+        self._free = asyncio.Queue()
+        self._low = []
+        self._top_ups = set()
+        self._top_up_scheduled = False
+        self.top_up_error = None  # Set once a top-up has been given up
+
+    async def open(self):
+        """Load the pool's accounts, creating or topping up any that need it"""
+        self.rent_exempt_reserve = (
+            await self.rpc.get_minimum_balance_for_rent_exemption(TOKEN_ACCOUNT_SIZE)
+        ).value
+
+        infos = []
+        for i in range(0, len(self.accounts), MAX_ACCOUNTS_PER_REQUEST):
+            chunk = self.accounts[i:i + MAX_ACCOUNTS_PER_REQUEST]
+            response = await self.rpc.get_multiple_accounts([account.address for account in chunk])
+            infos.extend(response.value)
+
+        groups = []
+        ready = []
+        for account, info in zip(self.accounts, infos):
+            if info is None:
+                # Fund at creation; initialize_account sets a native account's amount from its lamports
+                groups.append([
+                    create_account_with_seed(
+                        CreateAccountWithSeedParams(
+                            from_pubkey=self.owner.pubkey(),
+                            to_pubkey=account.address,
+                            base=self.owner.pubkey(),
+                            seed=account.seed,
+                            lamports=self.rent_exempt_reserve + self.target_balance,
+                            space=TOKEN_ACCOUNT_SIZE,
+                            owner=TOKEN_PROGRAM_ID
+                        )
+                    ),
+                    initialize_account(
+                        InitializeAccountParams(
+                            program_id=TOKEN_PROGRAM_ID,
+                            account=account.address,
+                            mint=WRAPPED_SOL_MINT,
+                            owner=self.owner.pubkey()
+                        )
+                    )
+                ])
+                account.balance = self.target_balance
+                ready.append(account)
+                continue
+
+            account.balance = int.from_bytes(info.data[AMOUNT_OFFSET:AMOUNT_OFFSET + 8], "little")
+            unsynced = info.lamports - self.rent_exempt_reserve - account.balance
+            if unsynced > 0:
+                account.record_native_deposit(unsynced)
+            if account.balance < self.low_balance:
+                self._low.append(account)
+            else:
+                sync = account.sync_instructions()
+                if sync:
+                    groups.append(sync)
+                ready.append(account)
+
+        low, self._low = self._low, []
+        groups += self._top_up_instructions(low)
+        if groups:
+            await self._submit(groups)
+        self._topped_up(low)
+        ready += low
+
+        for account in ready:
+            self._free.put_nowait(account)
+        return self
+
+    def _top_up_instructions(self, accounts):
+        groups = []
+        for account in accounts:
+            lamports = self.target_balance - account.balance
+            groups.append([
+                transfer(TransferParams(from_pubkey=self.owner.pubkey(), to_pubkey=account.address, lamports=lamports)),
+                # The transfer changes lamports outside the token program, so this sync is always needed
+                sync_native(SyncNativeParams(program_id=TOKEN_PROGRAM_ID, account=account.address))
+            ])
+        return groups
+
+    def _topped_up(self, accounts):
+        for account in accounts:
+            account.balance = self.target_balance
+            account.needs_sync = False
+
+    async def _submit(self, groups):
+        """Send instruction groups in as few transactions as fit, and wait for them to confirm"""
+        latest_blockhash = await self.rpc.get_latest_blockhash()
+        batches = []
+        for group in groups:
+            # A group (e.g. transfer + sync_native) always lands in one transaction
+            if batches:
+                message = MessageV0.try_compile(self.owner.pubkey(), batches[-1] + group, [], Hash.default())
+                if 1 + 64 + len(to_bytes_versioned(message)) <= PACKET_DATA_SIZE:
+                    batches[-1] += group
+                    continue
+            batches.append(list(group))
+
+        signatures = []
+        for batch in batches:
+            message = MessageV0.try_compile(self.owner.pubkey(), batch, [], latest_blockhash.value.blockhash)
+            transaction = VersionedTransaction(message, [self.owner])
+            await self.rpc.send_raw_transaction(bytes(transaction), TxOpts(skip_preflight=True))
+            signatures.append(transaction.signatures[0])
+        responses = await asyncio.gather(*(
+            self.rpc.confirm_transaction(
+                signature, "confirmed", last_valid_block_height=latest_blockhash.value.last_valid_block_height
+            )
+            for signature in signatures
+        ))
+        # With skip_preflight a failing transaction still lands, so check its error
+        for signature, response in zip(signatures, responses):
+            if response.value[0].err is not None:
+                raise RuntimeError(f"Transaction {signature} failed: {response.value[0].err}")
+
+    def _schedule_top_up(self, attempt=0):
+        if not self._top_up_scheduled:
+            self._top_up_scheduled = True
+            task = asyncio.create_task(self._top_up_later(attempt))
+            self._top_ups.add(task)
+            task.add_done_callback(self._top_ups.discard)
+
+    async def _top_up_later(self, attempt=0):
+        await asyncio.sleep(self.top_up_delay * 2 ** attempt)
+        accounts, self._low = self._low, []
+        self._top_up_scheduled = False  # Accounts released from now on go in the next top-up
+        try:
+            await self._submit(self._top_up_instructions(accounts))
+        except Exception as e:
+            self._low += accounts
+            if attempt + 1 < MAX_TOP_UP_ATTEMPTS:
+                print(f"Wrapped SOL top-up failed, retrying: {e!r}")
+                self._schedule_top_up(attempt + 1)
+                return
+            # Give up: the accounts stay held back and waiting tasks get the error
+            self.top_up_error = RuntimeError(f"Wrapped SOL top-up failed {MAX_TOP_UP_ATTEMPTS} times: {e!r}")
+            self._free.put_nowait(None)
+            return
+        self._topped_up(accounts)
+        for account in accounts:
+            self._free.put_nowait(account)
+
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow an account exclusively; update its `balance` as your transactions spend it"""
+        account = await self._free.get()
+        if account is None:
+            self._free.put_nowait(None)  # Pass the failure on to the next waiting task
+            raise self.top_up_error
+        try:
+            yield account
+        finally:
+            if account.balance < self.low_balance:
+                # Held back until a coalesced top-up lands
+                self._low.append(account)
+                self._schedule_top_up()
+            else:
+                self._free.put_nowait(account)
+
+    async def close(self, unwrap=False):
+        """Wait for pending top-ups; with `unwrap`, close every account back to the owner"""
+        while self._top_ups:
+            await asyncio.gather(*self._top_ups)
+        if self.top_up_error is not None:
+            raise self.top_up_error
+        if unwrap:
+            await self._submit([
+                [
+                    close_account(
+                        CloseAccountParams(
+                            program_id=TOKEN_PROGRAM_ID,
+                            account=account.address,
+                            dest=self.owner.pubkey(),
+                            owner=self.owner.pubkey()
+                        )
+                    )
+                ]
+                for account in self.accounts
+            ])
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, _exc_type, _exc, _tb):
+        await self.close()
+
+async def swap(pool, task_id):
+    """Stand-in for a swap that spends wrapped SOL from an exclusive pool account"""
+    async with pool.acquire() as account:
+        spent = 300_000_000
+        # ... build the swap with `account.sync_instructions()` prepended, using account.address ...
+        await asyncio.sleep(0.1)
+        account.balance -= spent
+        print(f"Task {task_id} used {account.address}, balance now {account.balance / 1e9} wSOL")
+
+async def main():
+    connection = AsyncClient("http://localhost:8899")
+
+    owner = Keypair()
+
+    async with connection:
+        airdrop = await connection.request_airdrop(owner.pubkey(), 10_000_000_000)
+        await connection.confirm_transaction(airdrop.value, "confirmed")
+
+        async with WrappedSolPool(connection, owner, size=4) as pool:
+            print(f"Pool accounts: {[str(account.address) for account in pool.accounts]}")
+            # Eight tasks share four accounts without ever holding the same one
+            await asyncio.gather(*(swap(pool, i) for i in range(8)))
+
+        # Later runs find the same accounts again from the owner and seeds
+        print("Wrapped SOL pool closed")
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
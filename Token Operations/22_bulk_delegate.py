@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Approve and Revoke Delegates in Bulk
+
+Rotating spending delegates across thousands of custody accounts one
+`approve_checked` at a time means thousands of transactions and a mint
+lookup for each. `rotate_delegates` takes (account, delegate, amount) rows
+(a delegate of None revokes), reads every token account's mint and owner
+with chunked `getMultipleAccounts`, looks up decimals once per mint, and
+packs `approve_checked` / `revoke` instructions into as few transactions as
+fit under the 1232-byte limit, counting one signature per distinct owner.
+
+Batches then run as one pipelined job: each batch is built, signed, sent
+and confirmed on its own, with a bounded number in flight, a shared cached
+blockhash, and a single poller that checks every outstanding signature
+with `getSignatureStatuses` in chunks of 256.
+"""
+
+import asyncio
+import time
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import _COMMITMENT_TO_SOLDERS
+from solana.rpc.types import DataSliceOpts, TxOpts
+from solders.compute_budget import set_compute_unit_limit
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0, to_bytes_versioned
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+from spl.token.constants import TOKEN_PROGRAM_ID
+from spl.token.instructions import approve_checked, ApproveCheckedParams, revoke, RevokeParams
+
+PACKET_DATA_SIZE = 1232  # Maximum serialized transaction size in bytes
+DELEGATE_COMPUTE_UNITS = 4_500  # approve_checked or revoke
+MAX_ACCOUNTS_PER_REQUEST = 100  # getMultipleAccounts limit
+MAX_SIGNATURES_PER_REQUEST = 256  # getSignatureStatuses limit
+MINT_DECIMALS_OFFSET = 44  # mint_authority_option (4) + mint_authority (32) + supply (8)
+BLOCKHASH_MAX_AGE_SECONDS = 10.0
+MAX_ATTEMPTS = 3  # Rebuilds with a fresh blockhash after an expiry
+
+async def get_multiple_accounts_data(rpc, addresses, data_slice, concurrency=8):
+    """Return account data (or None) for every address, one getMultipleAccounts call per 100"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_chunk(chunk):
+        async with semaphore:
+            response = await rpc.get_multiple_accounts(chunk, data_slice=data_slice)
+        return [account.data if account is not None else None for account in response.value]
+
+    chunks = [addresses[i:i + MAX_ACCOUNTS_PER_REQUEST] for i in range(0, len(addresses), MAX_ACCOUNTS_PER_REQUEST)]
+    results = await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+    return [data for chunk_data in results for data in chunk_data]
+
+async def build_instructions(rpc, rows, program_id=TOKEN_PROGRAM_ID):
+    """Turn (account, delegate, amount) rows into [(row, owner, instruction)]; raise on unknown accounts"""
+    accounts = list({account for account, _delegate, _amount in rows})
+    # mint and owner are the first 64 bytes of a token account
+    account_data = await get_multiple_accounts_data(rpc, accounts, DataSliceOpts(offset=0, length=64))
+    mint_and_owner = {}
+    for account, data in zip(accounts, account_data):
+        if data is None:
+            raise ValueError(f"Token account {account} does not exist")
+        mint_and_owner[account] = (Pubkey.from_bytes(data[0:32]), Pubkey.from_bytes(data[32:64]))
+
+    # Decimals once per mint, not once per account
+    mints = list({mint for mint, _owner in mint_and_owner.values()})
+    mint_data = await get_multiple_accounts_data(rpc, mints, DataSliceOpts(offset=MINT_DECIMALS_OFFSET, length=1))
+    decimals = {mint: data[0] for mint, data in zip(mints, mint_data)}
+
+    instructions = []
+    for row, (account, delegate, amount) in enumerate(rows):
+        mint, owner = mint_and_owner[account]
+        if delegate is None:
+            instruction = revoke(RevokeParams(program_id=program_id, account=account, owner=owner))
+        else:
+            instruction = approve_checked(
+                ApproveCheckedParams(
+                    program_id=program_id,
+                    source=account,
+                    mint=mint,
+                    delegate=delegate,
+                    owner=owner,
+                    amount=amount,
+                    decimals=decimals[mint]
+                )
+            )
+        instructions.append((row, owner, instruction))
+    return instructions
+
+def compile_batch(payer, instructions, recent_blockhash):
+    compute_budget = set_compute_unit_limit(DELEGATE_COMPUTE_UNITS * len(instructions))
+    return MessageV0.try_compile(
+        payer=payer,
+        instructions=[compute_budget] + instructions,
+        address_lookup_table_accounts=[],
+        recent_blockhash=recent_blockhash
+    )
+
+def transaction_size(message):
+    # Compact-u16 signature count, one signature per required signer, then the versioned message
+    return 1 + 64 * message.header.num_required_signatures + len(to_bytes_versioned(message))
+
+def pack_instructions(payer, instructions):
+    """Greedily pack [(row, owner, instruction)] items into batches that each fit one transaction"""
+    placeholder_blockhash = Hash.default()
+    batches = []
+    batch = []
+    for item in instructions:
+        if batch:
+            message = compile_batch(payer, [i for _row, _owner, i in batch] + [item[2]], placeholder_blockhash)
+            if transaction_size(message) <= PACKET_DATA_SIZE:
+                batch.append(item)
+                continue
+            batches.append(batch)
+        batch = [item]
+    if batch:
+        batches.append(batch)
+    return batches
+
+class _BlockhashCache:
+    def __init__(self, rpc, max_age=BLOCKHASH_MAX_AGE_SECONDS):
+        self.rpc = rpc
+        self.max_age = max_age
+        self.value = None
+        self.fetched_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def get(self, force=False):
+        """Return (blockhash, last_valid_block_height), refreshing at most once per `max_age`"""
+        async with self.lock:
+            if force or self.value is None or time.monotonic() - self.fetched_at > self.max_age:
+                response = await self.rpc.get_latest_blockhash()
+                self.value = (response.value.blockhash, response.value.last_valid_block_height)
+                self.fetched_at = time.monotonic()
+            return self.value
+
+class _StatusPoller:
+    """Resolves one future per signature from shared, chunked getSignatureStatuses calls"""
+
+    def __init__(self, rpc, poll_interval=1.0, commitment="confirmed"):
+        self.rpc = rpc
+        self.poll_interval = poll_interval
+        self.commitment_rank = int(_COMMITMENT_TO_SOLDERS[commitment])
+        self.pending = {}  # Signature -> (future, last_valid_block_height)
+        self._task = None
+
+    def track(self, signature, last_valid_block_height):
+        """Return a future for (err, expired) once the signature lands or its blockhash expires"""
+        future = asyncio.get_running_loop().create_future()
+        self.pending[signature] = (future, last_valid_block_height)
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll_loop())
+        return future
+
+    async def _poll_loop(self):
+        while self.pending:
+            await asyncio.sleep(self.poll_interval)
+            signatures = list(self.pending)
+            chunks = [
+                signatures[i:i + MAX_SIGNATURES_PER_REQUEST]
+                for i in range(0, len(signatures), MAX_SIGNATURES_PER_REQUEST)
+            ]
+            try:
+                responses = await asyncio.gather(
+                    *(self.rpc.get_signature_statuses(chunk) for chunk in chunks),
+                    self.rpc.get_block_height()
+                )
+            except Exception as e:
+                print(f"Signature status poll failed: {e!r}")
+                continue
+            block_height = responses[-1].value
+            statuses = [status for response in responses[:-1] for status in response.value]
+            for signature, status in zip(signatures, statuses):
+                future, last_valid_block_height = self.pending[signature]
+                if status is not None and status.err is not None:
+                    result = (status.err, False)
+                elif status is not None and status.confirmation_status is not None \
+                        and int(status.confirmation_status) >= self.commitment_rank:
+                    result = (None, False)
+                elif status is None and block_height > last_valid_block_height:
+                    result = (None, True)
+                else:
+                    continue
+                del self.pending[signature]
+                if not future.done():
+                    future.set_result(result)
+        self._task = None
+
+async def rotate_delegates(rpc, payer, owners, rows, concurrency=32, program_id=TOKEN_PROGRAM_ID):
+    """Apply (account, delegate or None, amount) rows; `owners` maps owner pubkey -> Keypair"""
+    instructions = await build_instructions(rpc, rows, program_id)
+    for _row, owner, _instruction in instructions:
+        if owner not in owners:
+            raise ValueError(f"No keypair for token account owner {owner}")
+
+    batches = pack_instructions(payer.pubkey(), instructions)
+    blockhashes = _BlockhashCache(rpc)
+    poller = _StatusPoller(rpc)
+    semaphore = asyncio.Semaphore(concurrency)
+    results = {"transactions": len(batches), "applied": 0, "failed": []}
+
+    async def run_batch(batch):
+        signers = [payer] + [
+            owners[owner] for owner in dict.fromkeys(owner for _row, owner, _i in batch) if owner != payer.pubkey()
+        ]
+        async with semaphore:
+            for attempt in range(MAX_ATTEMPTS):
+                recent_blockhash, last_valid_block_height = await blockhashes.get(force=attempt > 0)
+                message = compile_batch(payer.pubkey(), [i for _row, _owner, i in batch], recent_blockhash)
+                transaction = VersionedTransaction(message, signers)
+                try:
+                    await rpc.send_raw_transaction(bytes(transaction), TxOpts(skip_preflight=True))
+                except Exception as e:
+                    print(f"Send failed for {transaction.signatures[0]}: {e!r}")
+                err, expired = await poller.track(transaction.signatures[0], last_valid_block_height)
+                if not expired:
+                    break
+        rows_in_batch = [row for row, _owner, _i in batch]
+        if expired or err is not None:
+            results["failed"].extend((row, err or "expired") for row in rows_in_batch)
+        else:
+            results["applied"] += len(rows_in_batch)
+
+    await asyncio.gather(*(run_batch(batch) for batch in batches))
+    return results
+
+async def main():
+    rpc = AsyncClient("https://api.devnet.solana.com")
+
+    payer = Keypair()
+    custody_owner = Keypair()
+    new_delegate = Keypair().pubkey()
+
+    # Custody token accounts held by `custody_owner` (examples)
+    active_accounts = [Pubkey.from_string("GfVPzUxMDvhFJ1Xs6C9i47XQRSapTd8LHw5grGuTquyQ")]
+    retired_accounts = [Pubkey.from_string("4kg8oh3jdNtn7j2wcS7TrUua31AgbLzDVkBZgTAe44aF")]
+
+    # Hand active accounts to the new delegate and revoke retired ones, in one job
+    rows = [(account, new_delegate, 1_000_000_000) for account in active_accounts]
+    rows += [(account, None, 0) for account in retired_accounts]
+
+    async with rpc:
+        try:
+            results = await rotate_delegates(rpc, payer, {custody_owner.pubkey(): custody_owner}, rows)
+            print(f"New delegate: {new_delegate}")
+            print(f"Transactions: {results['transactions']}")
+            print(f"Applied: {results['applied']}, failed: {len(results['failed'])}")
+        except Exception as e:
+            print(f"Error rotating delegates: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
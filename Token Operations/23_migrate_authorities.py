@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Migrate Authorities in Bulk
+
+Rotating a key that controls hundreds of mints (or token accounts) one
+`set_authority` transaction at a time is slow and hard to resume. This
+migration reads every current authority with batched `getMultipleAccounts`
+and a `struct` decoder, skips anything already moved to the new key, packs
+the remaining `set_authority` instructions into few transactions, and
+checks the final state with one more batched read.
+
+Progress is printed per transaction and appended to a log. Because the plan
+is always rebuilt from on-chain state, rerunning after a crash simply picks
+up the authorities that have not moved yet.
+"""
+
+import asyncio
+import json
+import struct
+import time
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed
+from solana.rpc.types import TxOpts
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0, to_bytes_versioned
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+from spl.token.constants import TOKEN_PROGRAM_ID
+from spl.token.instructions import AuthorityType, set_authority, SetAuthorityParams
+
+PACKET_DATA_SIZE = 1232  # Maximum serialized transaction size in bytes
+MAX_ACCOUNTS_PER_REQUEST = 100  # getMultipleAccounts limit
+MINT_SIZE = 82
+TOKEN_ACCOUNT_SIZE = 165
+
+# mint_authority_option, mint_authority, supply, decimals, is_initialized,
+# freeze_authority_option, freeze_authority
+MINT_STRUCT = struct.Struct("<I32sQBBI32s")
+
+# mint, owner, amount, delegate_option, delegate, state, is_native_option,
+# is_native, delegated_amount, close_authority_option, close_authority
+TOKEN_ACCOUNT_STRUCT = struct.Struct("<32s32sQI32sBIQQI32s")
+
+def decode_authorities(data):
+    """Return {AuthorityType: Pubkey or None} for a mint or token account"""
+    if len(data) == MINT_SIZE:
+        mint_authority_option, mint_authority, _supply, _decimals, _is_initialized, \
+            freeze_authority_option, freeze_authority = MINT_STRUCT.unpack_from(data)
+        return {
+            AuthorityType.MINT_TOKENS: Pubkey.from_bytes(mint_authority) if mint_authority_option else None,
+            AuthorityType.FREEZE_ACCOUNT: Pubkey.from_bytes(freeze_authority) if freeze_authority_option else None
+        }
+    if len(data) == TOKEN_ACCOUNT_SIZE:
+        _mint, owner, _amount, _delegate_option, _delegate, _state, _is_native_option, \
+            _is_native, _delegated_amount, close_authority_option, close_authority = TOKEN_ACCOUNT_STRUCT.unpack_from(data)
+        return {
+            AuthorityType.ACCOUNT_OWNER: Pubkey.from_bytes(owner),
+            AuthorityType.CLOSE_ACCOUNT: Pubkey.from_bytes(close_authority) if close_authority_option else None
+        }
+    raise ValueError(f"Unexpected account size {len(data)}")
+
+async def read_authorities(rpc, addresses):
+    """Read the authorities of many mints or token accounts, 100 per getMultipleAccounts call"""
+    chunks = [addresses[i:i + MAX_ACCOUNTS_PER_REQUEST] for i in range(0, len(addresses), MAX_ACCOUNTS_PER_REQUEST)]
+    # Confirmed, to match how migration batches are confirmed
+    responses = await asyncio.gather(*(rpc.get_multiple_accounts(chunk, commitment=Confirmed) for chunk in chunks))
+    authorities = {}
+    for chunk, response in zip(chunks, responses):
+        for address, account in zip(chunk, response.value):
+            if account is None:
+                raise ValueError(f"Account {address} does not exist")
+            if account.owner != TOKEN_PROGRAM_ID:
+                raise ValueError(f"Account {address} is not owned by the token program")
+            authorities[address] = decode_authorities(account.data)
+    return authorities
+
+def plan_migration(authorities, old_authority, new_authority, authority_types):
+    """Return ([(address, authority_type)] to move, count already migrated, [(address, type, holder)] skipped)"""
+    to_move = []
+    migrated = 0
+    skipped = []
+    for address, current in authorities.items():
+        for authority_type in authority_types:
+            if authority_type not in current:
+                continue
+            holder = current[authority_type]
+            if holder == new_authority:
+                migrated += 1
+            elif holder == old_authority:
+                to_move.append((address, authority_type))
+            else:
+                # Held by another key (or disabled): not ours to move
+                skipped.append((address, authority_type, holder))
+    return to_move, migrated, skipped
+
+def pack_set_authority(payer, old_authority, new_authority, to_move):
+    """Pack set_authority instructions into batches of [(address, type, instruction)] that fit"""
+    num_signers = 1 if payer == old_authority else 2
+    placeholder_blockhash = Hash.default()
+    batches = []
+    batch = []
+    for address, authority_type in to_move:
+        instruction = set_authority(
+            SetAuthorityParams(
+                program_id=TOKEN_PROGRAM_ID,
+                account=address,
+                authority=authority_type,
+                current_authority=old_authority,
+                new_authority=new_authority
+            )
+        )
+        item = (address, authority_type, instruction)
+        if batch:
+            message = MessageV0.try_compile(payer, [i for _a, _t, i in batch] + [instruction], [], placeholder_blockhash)
+            if 1 + 64 * num_signers + len(to_bytes_versioned(message)) <= PACKET_DATA_SIZE:
+                batch.append(item)
+                continue
+            batches.append(batch)
+        batch = [item]
+    if batch:
+        batches.append(batch)
+    return batches
+
+async def migrate_authorities(
+    rpc,
+    payer,
+    old_authority,
+    new_authority,
+    addresses,
+    authority_types=(AuthorityType.MINT_TOKENS, AuthorityType.FREEZE_ACCOUNT),
+    progress_path=None,
+    concurrency=8
+):
+    """Move `authority_types` held by `old_authority` on `addresses` to `new_authority`"""
+    authorities = await read_authorities(rpc, addresses)
+    to_move, migrated, skipped = plan_migration(authorities, old_authority.pubkey(), new_authority, authority_types)
+    print(f"Authorities to move: {len(to_move)}, already migrated: {migrated}, held by other keys or disabled: {len(skipped)}")
+    for address, authority_type, holder in skipped:
+        print(f"  Skipping {authority_type.name} on {address}: held by {holder}")
+    if not to_move:
+        return {"moved": 0, "already_migrated": migrated, "skipped": skipped, "mismatched": []}
+
+    batches = pack_set_authority(payer.pubkey(), old_authority.pubkey(), new_authority, to_move)
+    signers = [payer] if payer.pubkey() == old_authority.pubkey() else [payer, old_authority]
+    progress = open(progress_path, "a") if progress_path else None
+    semaphore = asyncio.Semaphore(concurrency)
+    done = 0
+
+    async def run_batch(batch):
+        nonlocal done
+        async with semaphore:
+            latest_blockhash = await rpc.get_latest_blockhash()
+            message = MessageV0.try_compile(
+                payer.pubkey(), [i for _a, _t, i in batch], [], latest_blockhash.value.blockhash
+            )
+            transaction = VersionedTransaction(message, signers)
+            signature = transaction.signatures[0]
+            try:
+                await rpc.send_raw_transaction(bytes(transaction), TxOpts(skip_preflight=True))
+                response = await rpc.confirm_transaction(
+                    signature, "confirmed", last_valid_block_height=latest_blockhash.value.last_valid_block_height
+                )
+                # With skip_preflight a failing transaction still lands, so check its error
+                if response.value[0].err is not None:
+                    raise RuntimeError(f"transaction error {response.value[0].err}")
+            except Exception as e:
+                # The final read reports what did not move; rerun to retry
+                print(f"Batch {signature} failed: {e!r}")
+                return
+        done += len(batch)
+        print(f"[{done}/{len(to_move)}] {signature}")
+        if progress:
+            progress.write(json.dumps({
+                "signature": str(signature),
+                "moved": [[str(address), authority_type.name] for address, authority_type, _i in batch],
+                "time": time.time()
+            }) + "\n")
+            progress.flush()
+
+    try:
+        await asyncio.gather(*(run_batch(batch) for batch in batches))
+    finally:
+        if progress:
+            progress.close()
+
+    # Verify with one more batched read
+    final = await read_authorities(rpc, list({address for address, _type in to_move}))
+    mismatched = [
+        (address, authority_type, final[address][authority_type])
+        for address, authority_type in to_move
+        if final[address][authority_type] != new_authority
+    ]
+    return {
+        "moved": len(to_move) - len(mismatched),
+        "already_migrated": migrated,
+        "skipped": skipped,
+        "mismatched": mismatched
+    }
+
+async def main():
+    rpc = AsyncClient("https://api.devnet.solana.com")
+
+    # Example keypairs and addresses
+    payer = Keypair()
+    old_authority = Keypair()
+    new_authority = Keypair().pubkey()
+    mints = [Pubkey.from_string("4zMMC9srt5Ri5X14GAgXhaHii3GnPAEERYPJgZJDncDU")]
+
+    async with rpc:
+        try:
+            result = await migrate_authorities(
+                rpc, payer, old_authority, new_authority, mints,
+                progress_path="authority_migration.jsonl"
+            )
+            print(f"Moved: {result['moved']}, already migrated: {result['already_migrated']}")
+            print(f"Not moved after verification: {len(result['mismatched'])}")
+        except Exception as e:
+            print(f"Error migrating authorities: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
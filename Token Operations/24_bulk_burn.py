@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Burn Tokens from Many Accounts
+
+`07_burn_tokens.py` burns a fixed amount from one account. Burning the fees
+collected across thousands of accounts that way costs a balance lookup and
+a transaction per account. This job reads every balance with chunked
+`getMultipleAccounts` (only the mint, owner and amount bytes) and decodes
+them locally, burns everything above a per-account reserve, and packs the
+`burn_checked` instructions into as few transactions as fit under the
+1232-byte limit.
+
+Confirmation uses `getSignatureStatuses` in chunks of 256, so every read in
+the job is batched and its RPC cost grows with the number of transactions,
+not the number of accounts. At the end the mint supply is read again and
+its drop is checked against the total of the confirmed burns.
+"""
+
+import asyncio
+import struct
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed
+from solana.rpc.core import _COMMITMENT_TO_SOLDERS
+from solana.rpc.types import DataSliceOpts, TxOpts
+from solders.compute_budget import set_compute_unit_limit
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0, to_bytes_versioned
+from solders.pubkey import Pubkey
+from solders.transaction import VersionedTransaction
+from spl.token.constants import TOKEN_PROGRAM_ID
+from spl.token.instructions import burn_checked, BurnCheckedParams
+
+PACKET_DATA_SIZE = 1232  # Maximum serialized transaction size in bytes
+BURN_CHECKED_COMPUTE_UNITS = 4_500
+MAX_ACCOUNTS_PER_REQUEST = 100  # getMultipleAccounts limit
+MAX_SIGNATURES_PER_REQUEST = 256  # getSignatureStatuses limit
+
+# mint, owner, amount: the first 72 bytes of a token account
+BALANCE_STRUCT = struct.Struct("<32s32sQ")
+
+# mint_authority_option, mint_authority, supply, decimals
+MINT_SUPPLY_STRUCT = struct.Struct("<I32sQB")
+
+async def read_balances(rpc, accounts, mint, owner, concurrency=8):
+    """Return {token account: amount}, checking each account's mint and owner"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch_chunk(chunk):
+        async with semaphore:
+            response = await rpc.get_multiple_accounts(
+                chunk, commitment=Confirmed, data_slice=DataSliceOpts(offset=0, length=BALANCE_STRUCT.size)
+            )
+        return response.value
+
+    chunks = [accounts[i:i + MAX_ACCOUNTS_PER_REQUEST] for i in range(0, len(accounts), MAX_ACCOUNTS_PER_REQUEST)]
+    balances = {}
+    for chunk, infos in zip(chunks, await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))):
+        for account, info in zip(chunk, infos):
+            if info is None:
+                raise ValueError(f"Token account {account} does not exist")
+            account_mint, account_owner, amount = BALANCE_STRUCT.unpack_from(info.data)
+            if account_mint != bytes(mint) or account_owner != bytes(owner):
+                raise ValueError(f"Token account {account} does not hold {mint} for {owner}")
+            balances[account] = amount
+    return balances
+
+async def read_supply(rpc, mint):
+    """Return (supply, decimals) of a mint"""
+    response = await rpc.get_account_info(mint, commitment=Confirmed)
+    if response.value is None:
+        raise ValueError(f"Mint {mint} does not exist")
+    _mint_authority_option, _mint_authority, supply, decimals = MINT_SUPPLY_STRUCT.unpack_from(response.value.data)
+    return supply, decimals
+
+def burn_amounts(balances, keep=0):
+    """Return [(token account, amount to burn)], leaving `keep` base units in every account"""
+    return [(account, balance - keep) for account, balance in balances.items() if balance > keep]
+
+def transaction_size(message, num_signers):
+    # Compact-u16 signature count, the signatures, then the versioned message
+    return 1 + 64 * num_signers + len(to_bytes_versioned(message))
+
+def compile_burns(payer, instructions, recent_blockhash):
+    compute_budget = set_compute_unit_limit(BURN_CHECKED_COMPUTE_UNITS * len(instructions))
+    return MessageV0.try_compile(
+        payer=payer,
+        instructions=[compute_budget] + instructions,
+        address_lookup_table_accounts=[],
+        recent_blockhash=recent_blockhash
+    )
+
+def pack_burns(payer, owner, mint, decimals, burns, program_id=TOKEN_PROGRAM_ID):
+    """Pack burn_checked instructions into batches of (instructions, amount burned)"""
+    num_signers = 1 if payer == owner else 2
+    placeholder_blockhash = Hash.default()
+    batches = []
+    instructions, total = [], 0
+
+    for token_account, amount in burns:
+        instruction = burn_checked(
+            BurnCheckedParams(
+                program_id=program_id,
+                mint=mint,
+                account=token_account,
+                owner=owner,
+                amount=amount,
+                decimals=decimals
+            )
+        )
+        if instructions:
+            message = compile_burns(payer, instructions + [instruction], placeholder_blockhash)
+            if transaction_size(message, num_signers) <= PACKET_DATA_SIZE:
+                instructions.append(instruction)
+                total += amount
+                continue
+            batches.append((instructions, total))
+        instructions, total = [instruction], amount
+
+    if instructions:
+        batches.append((instructions, total))
+    return batches
+
+async def send_and_confirm(
+    rpc,
+    transactions,
+    last_valid_block_height,
+    concurrency=16,
+    poll_interval=1.0,
+    commitment="confirmed"
+):
+    """Send signed transactions and return {signature: None, the error, or "expired"} once each is final"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(transaction):
+        async with semaphore:
+            try:
+                await rpc.send_raw_transaction(bytes(transaction), TxOpts(skip_preflight=True))
+            except Exception as e:
+                # Left pending: it expires with the blockhash if it never landed
+                print(f"Send failed for {transaction.signatures[0]}: {e!r}")
+
+    await asyncio.gather(*(send(transaction) for transaction in transactions))
+
+    pending = [transaction.signatures[0] for transaction in transactions]
+    commitment_rank = int(_COMMITMENT_TO_SOLDERS[commitment])
+    results = {}
+
+    while pending:
+        await asyncio.sleep(poll_interval)
+        chunks = [pending[i:i + MAX_SIGNATURES_PER_REQUEST] for i in range(0, len(pending), MAX_SIGNATURES_PER_REQUEST)]
+        responses = await asyncio.gather(
+            *(rpc.get_signature_statuses(chunk) for chunk in chunks),
+            rpc.get_block_height()
+        )
+        block_height = responses[-1].value
+        statuses = [status for response in responses[:-1] for status in response.value]
+        still_pending = []
+        for signature, status in zip(pending, statuses):
+            if status is not None and status.err is not None:
+                results[signature] = status.err
+            elif status is not None and status.confirmation_status is not None \
+                    and int(status.confirmation_status) >= commitment_rank:
+                results[signature] = None
+            elif status is None and block_height > last_valid_block_height:
+                results[signature] = "expired"
+            else:
+                still_pending.append(signature)
+        pending = still_pending
+    return results
+
+async def burn_collected_fees(rpc, owner, mint, accounts, keep=0, payer=None, program_id=TOKEN_PROGRAM_ID):
+    """Burn every balance above `keep` in `accounts` and reconcile the mint supply"""
+    payer = payer or owner
+    balances, (supply_before, decimals) = await asyncio.gather(
+        read_balances(rpc, accounts, mint, owner.pubkey()),
+        read_supply(rpc, mint)
+    )
+    burns = burn_amounts(balances, keep)
+    result = {
+        "accounts": len(burns),
+        "transactions": 0,
+        "burned": 0,
+        "failed": [],
+        "supply_before": supply_before,
+        "supply_after": supply_before,
+        "unexplained": 0
+    }
+    if not burns:
+        return result
+
+    batches = pack_burns(payer.pubkey(), owner.pubkey(), mint, decimals, burns, program_id)
+    signers = [payer] if payer.pubkey() == owner.pubkey() else [payer, owner]
+    latest_blockhash = await rpc.get_latest_blockhash()
+    transactions = [
+        VersionedTransaction(compile_burns(payer.pubkey(), instructions, latest_blockhash.value.blockhash), signers)
+        for instructions, _total in batches
+    ]
+    results = await send_and_confirm(rpc, transactions, latest_blockhash.value.last_valid_block_height)
+
+    for transaction, (_instructions, total) in zip(transactions, batches):
+        signature = transaction.signatures[0]
+        if results[signature] is None:
+            result["burned"] += total
+        else:
+            result["failed"].append((signature, results[signature]))
+    result["transactions"] = len(transactions)
+
+    supply_after, _decimals = await read_supply(rpc, mint)
+    result["supply_after"] = supply_after
+    # Non-zero if anything else minted or burned this token while the job ran
+    result["unexplained"] = (supply_before - supply_after) - result["burned"]
+    return result
+
+async def main():
+    rpc = AsyncClient("https://api.devnet.solana.com")
+
+    # Fee collector that owns the fee accounts (example)
+    fee_collector = Keypair()
+    mint_address = Pubkey.from_string("4zMMC9srt5Ri5X14GAgXhaHii3GnPAEERYPJgZJDncDU")
+    fee_accounts = [Pubkey.from_string("GfVPzUxMDvhFJ1Xs6C9i47XQRSapTd8LHw5grGuTquyQ")]
+
+    async with rpc:
+        try:
+            result = await burn_collected_fees(rpc, fee_collector, mint_address, fee_accounts)
+            print(f"Accounts burned from: {result['accounts']} in {result['transactions']} transactions")
+            print(f"Burned: {result['burned']} base units, failed transactions: {len(result['failed'])}")
+            print(f"Supply: {result['supply_before']} -> {result['supply_after']}")
+            if result["unexplained"]:
+                print(f"Supply change not explained by this job: {result['unexplained']} base units")
+            else:
+                print("Supply delta matches the confirmed burns")
+        except Exception as e:
+            print(f"Error burning fees: {e}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Index Every Holder of a Mint
+
+`04_get_token_account.py` and `05_get_token_balance.py` look up one account
+at a time. To list every holder of a mint, this indexer sends a single
+`getProgramAccounts` to the token program, filtered to 165-byte accounts
+whose first 32 bytes (the mint) match, with a `dataSlice` of bytes 32..72
+so each account returns only its owner and amount.
+
+For a mint with millions of holders the response is hundreds of megabytes
+of JSON. Instead of loading it as one object, the response body is read as
+an httpx stream and each account object is decoded as soon as its text has
+arrived, so memory stays flat. Holders are written in batches to SQLite,
+indexed for top-N and per-owner lookups.
+
+Usage:
+    python 25_mint_holder_index.py index <MINT> --db holders.sqlite
+    python 25_mint_holder_index.py top <MINT> --db holders.sqlite -n 20
+    python 25_mint_holder_index.py owner <MINT> <OWNER> --db holders.sqlite
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import re
+import sqlite3
+import struct
+import time
+import httpx
+from solana.rpc.core import RPCException
+from solders.pubkey import Pubkey
+from spl.token.constants import TOKEN_PROGRAM_ID
+
+TOKEN_ACCOUNT_SIZE = 165
+OWNER_OFFSET = 32  # After the mint
+# owner, amount: bytes 32..72 of a token account
+OWNER_AMOUNT_STRUCT = struct.Struct("<32sQ")
+INSERT_BATCH_SIZE = 10_000
+
+RESULT_START = re.compile(r'"result"\s*:\s*\[')
+SEPARATOR = re.compile(r"[\s,]*")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS holders (
+    mint TEXT NOT NULL,
+    account TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    amount BLOB NOT NULL,  -- u64 big-endian: exceeds SQLite INTEGER, still sorts by value
+    PRIMARY KEY (mint, account)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS holders_by_amount ON holders (mint, amount DESC);
+CREATE INDEX IF NOT EXISTS holders_by_owner ON holders (mint, owner);
+CREATE TABLE IF NOT EXISTS indexed_mints (
+    mint TEXT PRIMARY KEY,
+    holders INTEGER NOT NULL,
+    indexed_at REAL NOT NULL
+);
+"""
+
+async def iter_json_array_items(text_chunks):
+    """Yield each element of a JSON-RPC response's `result` array as its text arrives"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = None  # Index inside the result array, once its start has been seen
+
+    async for chunk in text_chunks:
+        buffer += chunk
+        if position is None:
+            match = RESULT_START.search(buffer)
+            if match is None:
+                continue
+            position = match.end()
+        while True:
+            position = SEPARATOR.match(buffer, position).end()
+            if position == len(buffer):
+                break
+            if buffer[position] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                break  # The element is incomplete; wait for the next chunk
+            yield item
+            position = end
+        # Drop what has been consumed so the buffer only ever holds a partial element
+        buffer = buffer[position:]
+        position = 0
+
+    if position is None:
+        # No result array: an error response, which is small enough to load whole
+        response = json.loads(buffer)
+        raise RPCException(response.get("error", response))
+    raise ValueError("Response ended inside the result array")
+
+async def stream_mint_holders(http, rpc_url, mint, program_id=TOKEN_PROGRAM_ID, commitment="confirmed"):
+    """Yield (account, owner, amount) for every token account of `mint`"""
+    request = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "getProgramAccounts",
+        "params": [
+            str(program_id),
+            {
+                "encoding": "base64",
+                "commitment": commitment,
+                "dataSlice": {"offset": OWNER_OFFSET, "length": OWNER_AMOUNT_STRUCT.size},
+                "filters": [
+                    {"dataSize": TOKEN_ACCOUNT_SIZE},
+                    {"memcmp": {"offset": 0, "bytes": str(mint)}}
+                ]
+            }
+        ]
+    }
+    async with http.stream("POST", rpc_url, json=request) as response:
+        response.raise_for_status()
+        async for item in iter_json_array_items(response.aiter_text()):
+            owner, amount = OWNER_AMOUNT_STRUCT.unpack(base64.b64decode(item["account"]["data"][0]))
+            yield item["pubkey"], str(Pubkey.from_bytes(owner)), amount
+
+def open_index(path):
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    return db
+
+async def index_mint(db, http, rpc_url, mint, skip_empty=True, program_id=TOKEN_PROGRAM_ID):
+    """Replace the stored holders of `mint` with a fresh snapshot; return the number stored"""
+    mint = str(mint)
+    count = 0
+    batch = []
+    with db:
+        # One transaction: readers keep seeing the previous snapshot until this commits
+        db.execute("DELETE FROM holders WHERE mint = ?", (mint,))
+        async for account, owner, amount in stream_mint_holders(http, rpc_url, mint, program_id):
+            if skip_empty and amount == 0:
+                continue
+            batch.append((mint, account, owner, amount.to_bytes(8, "big")))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                db.executemany("INSERT INTO holders VALUES (?, ?, ?, ?)", batch)
+                count += len(batch)
+                batch = []
+        db.executemany("INSERT INTO holders VALUES (?, ?, ?, ?)", batch)
+        count += len(batch)
+        db.execute("INSERT OR REPLACE INTO indexed_mints VALUES (?, ?, ?)", (mint, count, time.time()))
+    return count
+
+def top_holders(db, mint, limit=20):
+    """Return the `limit` largest token accounts of `mint` as [(account, owner, amount)]"""
+    rows = db.execute(
+        "SELECT account, owner, amount FROM holders WHERE mint = ? ORDER BY amount DESC LIMIT ?",
+        (str(mint), limit)
+    )
+    return [(account, owner, int.from_bytes(amount, "big")) for account, owner, amount in rows]
+
+def owner_holdings(db, mint, owner):
+    """Return [(account, amount)] for every indexed account of `mint` held by `owner`"""
+    rows = db.execute(
+        "SELECT account, amount FROM holders WHERE mint = ? AND owner = ?",
+        (str(mint), str(owner))
+    )
+    return [(account, int.from_bytes(amount, "big")) for account, amount in rows]
+
+async def main():
+    parser = argparse.ArgumentParser(description="Index every holder of a mint into SQLite")
+    parser.add_argument("--db", default="holders.sqlite", help="SQLite index file")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subcommands.add_parser("index", help="Fetch and store a fresh holder snapshot")
+    index_parser.add_argument("mint")
+    index_parser.add_argument("--rpc", default="https://api.devnet.solana.com")
+    index_parser.add_argument("--include-empty", action="store_true", help="Also store zero-balance accounts")
+
+    top_parser = subcommands.add_parser("top", help="Show the largest token accounts")
+    top_parser.add_argument("mint")
+    top_parser.add_argument("-n", type=int, default=20)
+
+    owner_parser = subcommands.add_parser("owner", help="Show one owner's token accounts")
+    owner_parser.add_argument("mint")
+    owner_parser.add_argument("owner")
+    args = parser.parse_args()
+
+    mint = Pubkey.from_string(args.mint)
+    db = open_index(args.db)
+    try:
+        if args.command == "index":
+            # No read timeout: the node may take a while to start streaming a large result
+            async with httpx.AsyncClient(timeout=httpx.Timeout(30.0, read=None)) as http:
+                start = time.perf_counter()
+                count = await index_mint(db, http, args.rpc, mint, skip_empty=not args.include_empty)
+            print(f"Indexed {count} holders of {mint} in {time.perf_counter() - start:.1f}s")
+        elif args.command == "top":
+            for rank, (account, owner, amount) in enumerate(top_holders(db, mint, args.n), start=1):
+                print(f"{rank:>4}. {owner} {amount} ({account})")
+        else:
+            holdings = owner_holdings(db, mint, Pubkey.from_string(args.owner))
+            for account, amount in holdings:
+                print(f"{account}: {amount}")
+            print(f"Total: {sum(amount for _account, amount in holdings)} in {len(holdings)} accounts")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
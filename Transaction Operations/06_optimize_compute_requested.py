@@ -11,18 +11,15 @@ from solders.transaction import VersionedTransaction
 from solders.message import MessageV0
 from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price
 
-async def get_simulation_compute_units(rpc, instructions, payer_pubkey, lookup_tables=[]):
+async def get_simulation_compute_units(rpc, instructions, payer_pubkey, recent_blockhash, lookup_tables=[]):
     """Simulate transaction to get actual compute units needed"""
     try:
-        # Create a temporary transaction for simulation
-        recent_blockhash = await rpc.get_latest_blockhash()
-        
-        # Create message for simulation
+        # Create message for simulation, reusing the caller's blockhash
         message = MessageV0.try_compile(
             payer=payer_pubkey,
             instructions=instructions,
             address_lookup_table_accounts=lookup_tables,
-            recent_blockhash=recent_blockhash.value.blockhash
+            recent_blockhash=recent_blockhash
         )
         
         # Create transaction for simulation
@@ -51,8 +48,12 @@ async def build_optimal_transaction(rpc, instructions, signer, lookup_tables=[])
     # See the equivalent JavaScript guide for context here:
     # https://solana.com/zh/developers/guides/advanced/how-to-request-optimal-compute
     micro_lamports = 100  # Get optimal priority fees
-    units = await get_simulation_compute_units(rpc, instructions, signer.pubkey(), lookup_tables)
+    
+    # Fetch the blockhash once and use it for both simulation and the final message
     recent_blockhash = await rpc.get_latest_blockhash()
+    units = await get_simulation_compute_units(
+        rpc, instructions, signer.pubkey(), recent_blockhash.value.blockhash, lookup_tables
+    )
     
     # Add compute budget instructions at the beginning (like unshift in JS)
     instructions.insert(0, set_compute_unit_price(micro_lamports))
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Prefetch Blockhashes in the Background
+
+Calling `get_latest_blockhash()` right before every `MessageV0.try_compile`
+adds one RPC round trip to each transaction. A `BlockhashProvider` refreshes
+the blockhash on a timer in a background task, so transaction builders read
+it synchronously without ever touching the network.
+"""
+
+import asyncio
+import time
+from solana.rpc.async_api import AsyncClient
+from solders.keypair import Keypair
+from solders.system_program import transfer, TransferParams
+from solders.transaction import VersionedTransaction
+from solders.message import MessageV0
+
+# A blockhash is valid for 150 blocks (~60 seconds); refresh well before that
+REFRESH_INTERVAL_SECONDS = 2.0
+MAX_BLOCKHASH_AGE_SECONDS = 45.0
+
+class BlockhashProvider:
+    """Keeps the latest blockhash and its last valid block height in memory"""
+
+    def __init__(
+        self,
+        rpc,
+        refresh_interval=REFRESH_INTERVAL_SECONDS,
+        max_age=MAX_BLOCKHASH_AGE_SECONDS,
+        commitment=None
+    ):
+        self.rpc = rpc
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.commitment = commitment
+        self.blockhash = None
+        self.last_valid_block_height = None
+        self.fetched_at = 0.0
+        self._task = None
+
+    async def refresh(self):
+        response = await self.rpc.get_latest_blockhash(self.commitment)
+        self.blockhash = response.value.blockhash
+        self.last_valid_block_height = response.value.last_valid_block_height
+        self.fetched_at = time.monotonic()
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                # Keep serving the previous blockhash until it goes stale
+                print(f"Blockhash refresh failed: {e!r}")
+
+    async def start(self):
+        # The first fetch is awaited so latest() is usable as soon as start() returns
+        await self.refresh()
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def latest(self):
+        """Return (blockhash, last_valid_block_height) without a network call"""
+        if self.blockhash is None:
+            raise RuntimeError("BlockhashProvider has not been started")
+        if time.monotonic() - self.fetched_at > self.max_age:
+            raise RuntimeError("Cached blockhash is stale; the refresh task is failing")
+        return self.blockhash, self.last_valid_block_height
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, _exc_type, _exc, _tb):
+        await self.stop()
+
+def build_transfer(blockhashes, sender, recipient, lamports):
+    """Build a signed transfer using the prefetched blockhash"""
+    recent_blockhash, last_valid_block_height = blockhashes.latest()
+
+    transfer_instruction = transfer(
+        TransferParams(
+            from_pubkey=sender.pubkey(),
+            to_pubkey=recipient.pubkey(),
+            lamports=lamports
+        )
+    )
+
+    message = MessageV0.try_compile(
+        payer=sender.pubkey(),
+        instructions=[transfer_instruction],
+        address_lookup_table_accounts=[],
+        recent_blockhash=recent_blockhash
+    )
+
+    return VersionedTransaction(message, [sender]), last_valid_block_height
+
+async def main():
+    rpc = AsyncClient("https://api.devnet.solana.com")
+
+    sender = Keypair()
+    recipients = [Keypair() for _ in range(5)]
+
+    async with rpc, BlockhashProvider(rpc) as blockhashes:
+        for recipient in recipients:
+            # No RPC call here: the blockhash comes from memory
+            transaction, last_valid_block_height = build_transfer(
+                blockhashes, sender, recipient, 1_000_000
+            )
+            print(f"Recipient: {recipient.pubkey()}")
+            print(f"Blockhash: {transaction.message.recent_blockhash}")
+            print(f"Last valid block height: {last_valid_block_height}")
+
+        print(f"{len(recipients)} transactions built with a single blockhash fetch")
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Confirm Many Transactions with Batched Status Polling
+
+`confirm_transaction` polls one signature per call. A `ConfirmationEngine`
+keeps every outstanding signature in one table, polls `getSignatureStatuses`
+in chunks of 256 on a single timer, and resolves a future per signature once
+it reaches the commitment its caller asked for. Entries whose blockhash has
+passed its `last_valid_block_height` are expired instead of polled forever.
+"""
+
+import asyncio
+import time
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import (
+    _COMMITMENT_TO_SOLDERS,
+    TransactionExpiredBlockheightExceededError,
+    UnconfirmedTxError,
+)
+from solders.keypair import Keypair
+
+# getSignatureStatuses accepts at most 256 signatures per call
+MAX_SIGNATURES_PER_REQUEST = 256
+
+class _PendingSignature:
+    def __init__(self, last_valid_block_height, deadline):
+        self.waiters = []  # (future, commitment rank): one per caller
+        self.last_valid_block_height = last_valid_block_height
+        self.deadline = deadline
+
+    def fail(self, error):
+        for future, _rank in self.waiters:
+            if not future.done():
+                future.set_exception(error)
+        self.waiters = []
+
+class ConfirmationEngine:
+    """Confirms any number of signatures with a few getSignatureStatuses calls per tick"""
+
+    def __init__(self, rpc, poll_interval=0.5, timeout=90):
+        self.rpc = rpc
+        self.poll_interval = poll_interval
+        self.timeout = timeout  # Only used for signatures tracked without a block height
+        self.pending = {}  # Signature -> _PendingSignature
+        self.rpc_calls = 0
+        self._task = None
+
+    def track(self, signature, commitment="confirmed", last_valid_block_height=None):
+        """Start tracking a signature and return a future for its status at `commitment`"""
+        entry = self.pending.get(signature)
+        if entry is None:
+            entry = self.pending[signature] = _PendingSignature(
+                last_valid_block_height,
+                time.monotonic() + self.timeout
+            )
+        elif entry.last_valid_block_height is None:
+            entry.last_valid_block_height = last_valid_block_height
+        # Every caller gets its own future, so one caller's timeout or cancellation leaves the others waiting
+        future = asyncio.get_running_loop().create_future()
+        entry.waiters.append((future, int(_COMMITMENT_TO_SOLDERS[commitment])))
+        return future
+
+    async def confirm(self, signature, commitment="confirmed", last_valid_block_height=None):
+        return await self.track(signature, commitment, last_valid_block_height)
+
+    async def poll(self):
+        """Run one polling round over every outstanding signature"""
+        # Drop waiters whose caller has gone away, and signatures nobody waits for
+        for signature, entry in list(self.pending.items()):
+            entry.waiters = [(future, rank) for future, rank in entry.waiters if not future.done()]
+            if not entry.waiters:
+                del self.pending[signature]
+        if not self.pending:
+            return
+
+        signatures = list(self.pending)
+        chunks = [
+            signatures[i:i + MAX_SIGNATURES_PER_REQUEST]
+            for i in range(0, len(signatures), MAX_SIGNATURES_PER_REQUEST)
+        ]
+        requests = [self.rpc.get_signature_statuses(chunk) for chunk in chunks]
+        needs_block_height = any(e.last_valid_block_height is not None for e in self.pending.values())
+        if needs_block_height:
+            requests.append(self.rpc.get_block_height())
+        responses = await asyncio.gather(*requests)
+        self.rpc_calls += len(requests)
+
+        block_height = responses.pop().value if needs_block_height else None
+        statuses = [status for response in responses for status in response.value]
+        now = time.monotonic()
+
+        for signature, status in zip(signatures, statuses):
+            entry = self.pending.get(signature)
+            if entry is None:
+                continue
+            if status is not None and status.confirmation_status is not None:
+                reached = int(status.confirmation_status)
+                waiting = []
+                for future, rank in entry.waiters:
+                    if future.done():
+                        continue
+                    if reached >= rank:
+                        future.set_result(status)
+                    else:
+                        waiting.append((future, rank))
+                entry.waiters = waiting
+            if entry.last_valid_block_height is not None:
+                # Once landed it cannot expire, only wait to reach the commitment
+                if status is None and block_height > entry.last_valid_block_height:
+                    entry.fail(
+                        TransactionExpiredBlockheightExceededError(f"{signature} has expired: block height exceeded")
+                    )
+            elif now > entry.deadline:
+                entry.fail(UnconfirmedTxError(f"Unable to confirm transaction {signature}"))
+            if not entry.waiters:
+                del self.pending[signature]
+
+    async def _poll_loop(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll()
+            except Exception as e:
+                # A failed round is retried on the next tick
+                print(f"Signature status poll failed: {e!r}")
+
+    async def start(self):
+        self._task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for entry in self.pending.values():
+            for future, _rank in entry.waiters:
+                future.cancel()
+        self.pending.clear()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, _exc_type, _exc, _tb):
+        await self.stop()
+
+async def main():
+    connection = AsyncClient("http://localhost:8899")
+
+    wallets = [Keypair() for _ in range(20)]
+
+    async with connection, ConfirmationEngine(connection) as engine:
+        # Request all airdrops up front, then confirm them together
+        airdrops = await asyncio.gather(
+            *(connection.request_airdrop(wallet.pubkey(), 1_000_000_000) for wallet in wallets)
+        )
+        latest_blockhash = await connection.get_latest_blockhash()
+        last_valid_block_height = latest_blockhash.value.last_valid_block_height
+
+        results = await asyncio.gather(
+            *(engine.confirm(airdrop.value, "confirmed", last_valid_block_height) for airdrop in airdrops),
+            return_exceptions=True
+        )
+
+        confirmed = sum(1 for result in results if not isinstance(result, Exception))
+        print(f"Confirmed {confirmed}/{len(wallets)} airdrops")
+        print(f"RPC calls used for confirmation: {engine.rpc_calls}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
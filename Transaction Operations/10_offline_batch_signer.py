@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Sign Large Batches of Transactions Offline
+
+Building a new `nacl.signing.SigningKey` for every signature, and signing one
+message at a time, limits how fast an offline machine can sign. The
+`OfflineSigner` below caches one signing key per signer and signs batches of
+serialized `MessageV0` bytes (`to_bytes_versioned(message)`, which is what a
+v0 transaction signature covers) on worker threads, returning signatures in
+input order.
+
+For transactions that need several signers, a shared batch file carries the
+messages from signer to signer: each one adds its signatures in turn, and the
+last step assembles the fully signed transactions.
+"""
+
+import base64
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from solders.hash import Hash
+from solders.keypair import Keypair
+from solders.message import MessageV0, from_bytes_versioned, to_bytes_versioned
+from solders.signature import Signature
+from solders.system_program import transfer, TransferParams
+from solders.transaction import VersionedTransaction
+import nacl.signing
+
+class OfflineSigner:
+    """Signs batches of serialized messages with cached signing keys"""
+
+    def __init__(self, keypairs, workers=None, chunk_size=256):
+        # One SigningKey per signer, built once instead of once per signature
+        self.signing_keys = {
+            keypair.pubkey(): nacl.signing.SigningKey(bytes(keypair)[0:32])
+            for keypair in keypairs
+        }
+        self.chunk_size = chunk_size
+        self.executor = ThreadPoolExecutor(workers)
+
+    def _sign_chunk(self, signing_key, messages):
+        return [Signature.from_bytes(signing_key.sign(message).signature) for message in messages]
+
+    def sign_batch(self, signer, messages):
+        """Sign every message with `signer`'s key and return signatures in input order"""
+        signing_key = self.signing_keys[signer]
+        chunks = [messages[i:i + self.chunk_size] for i in range(0, len(messages), self.chunk_size)]
+        signatures = []
+        # PyNaCl releases the GIL while signing, so chunks run in parallel
+        for chunk_signatures in self.executor.map(lambda chunk: self._sign_chunk(signing_key, chunk), chunks):
+            signatures.extend(chunk_signatures)
+        return signatures
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _exc_type, _exc, _tb):
+        self.close()
+
+def required_signers(message_bytes):
+    message = from_bytes_versioned(message_bytes)
+    return message.account_keys[:message.header.num_required_signatures]
+
+def create_batch_file(path, messages):
+    """Start a batch file holding serialized messages and empty signature slots"""
+    batch = {
+        "messages": [base64.b64encode(to_bytes_versioned(message)).decode() for message in messages],
+        "signatures": [{} for _ in messages]
+    }
+    _write_batch(path, batch)
+
+def _write_batch(path, batch):
+    # Write to a temporary file first so a crash never leaves a half-written batch
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w") as batch_file:
+        json.dump(batch, batch_file)
+    os.replace(temporary_path, path)
+
+def add_signatures(path, signer):
+    """Partial signing: add a signature from every key `signer` holds to the messages that require it"""
+    with open(path) as batch_file:
+        batch = json.load(batch_file)
+
+    messages = [base64.b64decode(message) for message in batch["messages"]]
+    message_signers = [required_signers(message) for message in messages]
+
+    signed = 0
+    for pubkey in signer.signing_keys:
+        positions = [i for i, pubkeys in enumerate(message_signers) if pubkey in pubkeys]
+        signatures = signer.sign_batch(pubkey, [messages[i] for i in positions])
+        for i, signature in zip(positions, signatures):
+            batch["signatures"][i][str(pubkey)] = str(signature)
+        signed += len(positions)
+
+    _write_batch(path, batch)
+    return signed
+
+def assemble_transactions(path):
+    """Build fully signed transactions once every required signer has signed"""
+    with open(path) as batch_file:
+        batch = json.load(batch_file)
+
+    transactions = []
+    for encoded, signatures in zip(batch["messages"], batch["signatures"]):
+        message = from_bytes_versioned(base64.b64decode(encoded))
+        ordered = []
+        for pubkey in message.account_keys[:message.header.num_required_signatures]:
+            if str(pubkey) not in signatures:
+                raise ValueError(f"Missing signature from {pubkey}")
+            ordered.append(Signature.from_string(signatures[str(pubkey)]))
+        transactions.append(VersionedTransaction.populate(message, ordered))
+    return transactions
+
+def main():
+    fee_payer = Keypair()
+    alice = Keypair()
+    recipients = [Keypair().pubkey() for _ in range(2_000)]
+
+    # A blockhash fetched earlier on an online machine
+    recent_blockhash = Hash.new_unique()
+
+    # 1. Create transactions: alice pays each recipient, fee_payer pays the fees
+    messages = [
+        MessageV0.try_compile(
+            payer=fee_payer.pubkey(),
+            instructions=[
+                transfer(TransferParams(from_pubkey=alice.pubkey(), to_pubkey=recipient, lamports=1_000))
+            ],
+            address_lookup_table_accounts=[],
+            recent_blockhash=recent_blockhash
+        )
+        for recipient in recipients
+    ]
+    batch_path = "offline_batch.json"
+    create_batch_file(batch_path, messages)
+
+    # 2. Sign: each signer adds its signatures to the shared batch file in turn
+    start = time.perf_counter()
+    with OfflineSigner([fee_payer]) as signer:
+        signed = add_signatures(batch_path, signer)
+        print(f"Fee payer signed {signed} messages")
+    with OfflineSigner([alice]) as signer:
+        signed = add_signatures(batch_path, signer)
+        print(f"Alice signed {signed} messages")
+    elapsed = time.perf_counter() - start
+    print(f"Signing took {elapsed:.2f}s ({2 * len(messages) / elapsed:,.0f} signatures/s)")
+
+    # 3. Recover transactions, ready to send from an online machine
+    transactions = assemble_transactions(batch_path)
+    assert transactions[0] == VersionedTransaction(messages[0], [fee_payer, alice])
+    print(f"Assembled {len(transactions)} fully signed transactions")
+    print(f"First signature: {transactions[0].signatures[0]}")
+
+    os.remove(batch_path)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
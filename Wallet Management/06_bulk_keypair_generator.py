@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Generate Keypairs in Bulk (with Vanity Patterns)
+
+Generates any number of keypairs on every core through a process pool,
+optionally keeping only addresses that start or end with a base58 pattern.
+Keypairs are written to a compact binary file of fixed 64-byte records
+(secret key followed by public key, the same layout as `bytes(Keypair)`),
+plus an index of (pubkey, record number) entries sorted by pubkey.
+
+Usage:
+    python 06_bulk_keypair_generator.py 100000 --out fee_payers
+    python 06_bulk_keypair_generator.py 10 --prefix So1 --out vanity
+
+Keep the output files as secret as any other private key.
+"""
+
+import argparse
+import os
+import struct
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from solders.keypair import Keypair
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+RECORD_SIZE = 64  # 32-byte secret + 32-byte pubkey
+INDEX_ENTRY = struct.Struct("<32sI")  # pubkey, record number
+BATCH_SIZE = 5_000  # Keypairs per worker task without a pattern
+VANITY_ATTEMPTS = 20_000  # Keypairs tried per worker task with a pattern
+
+def validate_pattern(pattern):
+    invalid = set(pattern) - set(BASE58_ALPHABET)
+    if invalid:
+        raise ValueError(f"Pattern {pattern!r} contains non-base58 characters: {''.join(sorted(invalid))}")
+
+def _generate(count):
+    """Worker: return `count` keypairs as concatenated 64-byte records"""
+    return b"".join(bytes(Keypair()) for _ in range(count))
+
+def _search(attempts, prefix, suffix):
+    """Worker: try `attempts` keypairs and return the matching ones as concatenated 64-byte records"""
+    records = bytearray()
+    for _ in range(attempts):
+        keypair = Keypair()
+        address = str(keypair.pubkey())
+        if address.startswith(prefix) and address.endswith(suffix):
+            records += bytes(keypair)
+    return bytes(records)
+
+def generate_keypairs(count, out_path, prefix="", suffix="", workers=None):
+    """Write `count` keypairs to `<out_path>.bin` and a sorted pubkey index to `<out_path>.idx`"""
+    validate_pattern(prefix)
+    validate_pattern(suffix)
+    workers = workers or os.cpu_count()
+    index = []
+
+    # Raw secret keys: readable by the owner only, whatever the umask
+    records_fd = os.open(out_path + ".bin", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(records_fd, 0o600)
+    with os.fdopen(records_fd, "wb") as records_file, ProcessPoolExecutor(workers) as executor:
+
+        def write(records):
+            # Write batches as they finish so memory holds only the index
+            for offset in range(0, len(records), RECORD_SIZE):
+                index.append((records[offset + 32:offset + 64], len(index)))
+            records_file.write(records)
+
+        if prefix or suffix:
+            # Every worker searches fixed-size chunks until enough matches are in
+            futures = {executor.submit(_search, VANITY_ATTEMPTS, prefix, suffix) for _ in range(workers)}
+            while len(index) < count:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future.result()[:(count - len(index)) * RECORD_SIZE])
+                if len(index) < count:
+                    futures |= {executor.submit(_search, VANITY_ATTEMPTS, prefix, suffix) for _ in done}
+            for future in futures:
+                future.cancel()
+        else:
+            batches = [min(BATCH_SIZE, count - start) for start in range(0, count, BATCH_SIZE)]
+            for future in as_completed([executor.submit(_generate, size) for size in batches]):
+                write(future.result())
+
+    index.sort()
+    with open(out_path + ".idx", "wb") as index_file:
+        for pubkey, record_number in index:
+            index_file.write(INDEX_ENTRY.pack(pubkey, record_number))
+
+    return len(index)
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate keypairs on every core")
+    parser.add_argument("count", type=int, help="Number of keypairs to generate")
+    parser.add_argument("--prefix", default="", help="Base58 prefix the address must start with")
+    parser.add_argument("--suffix", default="", help="Base58 suffix the address must end with")
+    parser.add_argument("--out", default="keypairs", help="Output path without extension")
+    parser.add_argument("--workers", type=int, default=None, help="Processes (default: all cores)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    written = generate_keypairs(args.count, args.out, args.prefix, args.suffix, args.workers)
+    elapsed = time.perf_counter() - start
+
+    workers = args.workers or os.cpu_count()
+    print(f"Generated {written} keypairs in {elapsed:.2f}s ({written / elapsed:,.0f}/s) on {workers} workers")
+    print(f"Keypairs: {args.out}.bin ({written * RECORD_SIZE} bytes)")
+    print(f"Index: {args.out}.idx ({written * INDEX_ENTRY.size} bytes)")
+
+    # Records load straight back into solders
+    with open(args.out + ".bin", "rb") as records_file:
+        first = Keypair.from_bytes(records_file.read(RECORD_SIZE))
+    print(f"First address: {first.pubkey()}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Verify Many Signed Messages at Once
+
+Building a `nacl.signing.VerifyKey` for every message wastes work when the
+same users sign in again and again. `BatchVerifier` caches `VerifyKey`
+objects per pubkey, verifies (pubkey, message, signature) triples in a
+thread pool (PyNaCl releases the GIL while verifying), and returns a result
+bitmap with one bit per triple.
+
+Run with `--benchmark` to measure throughput at batch sizes from 1 to 100k.
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from solders.keypair import Keypair
+import nacl.signing
+import nacl.exceptions
+
+class BatchVerifier:
+    """Verifies batches of Ed25519 signatures with cached verify keys"""
+
+    def __init__(self, max_cached_keys=100_000, workers=None, min_chunk_size=256):
+        self.workers = workers or os.cpu_count()
+        self.executor = ThreadPoolExecutor(self.workers)
+        self.min_chunk_size = min_chunk_size  # Smaller batches are verified inline
+        self.verify_key = lru_cache(maxsize=max_cached_keys)(nacl.signing.VerifyKey)
+
+    def _verify_chunk(self, triples):
+        results = []
+        for pubkey, message, signature in triples:
+            try:
+                self.verify_key(bytes(pubkey)).verify(message, bytes(signature))
+                results.append(True)
+            except (nacl.exceptions.BadSignatureError, ValueError, TypeError):
+                results.append(False)
+        return results
+
+    def verify_batch(self, triples):
+        """Return a bitmap where bit i is set when triples[i] carries a valid signature"""
+        triples = list(triples)
+        chunk_size = max(self.min_chunk_size, -(-len(triples) // self.workers))
+        chunks = [triples[i:i + chunk_size] for i in range(0, len(triples), chunk_size)]
+
+        if len(chunks) <= 1:
+            chunk_results = [self._verify_chunk(chunk) for chunk in chunks]
+        else:
+            chunk_results = self.executor.map(self._verify_chunk, chunks)
+
+        bitmap = bytearray((len(triples) + 7) // 8)
+        i = 0
+        for results in chunk_results:
+            for valid in results:
+                if valid:
+                    bitmap[i >> 3] |= 1 << (i & 7)
+                i += 1
+        return bitmap
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _exc_type, _exc, _tb):
+        self.close()
+
+def is_valid(bitmap, i):
+    return bool(bitmap[i >> 3] & (1 << (i & 7)))
+
+def make_signed_messages(count, signers=1_000):
+    """Login-style messages from a fixed set of users, so pubkeys repeat"""
+    keypairs = [Keypair() for _ in range(min(signers, count))]
+    triples = []
+    for i in range(count):
+        keypair = keypairs[i % len(keypairs)]
+        message = f"Sign in to example.com, nonce {i}".encode()
+        triples.append((keypair.pubkey(), message, keypair.sign_message(message)))
+    return triples
+
+def benchmark():
+    all_triples = make_signed_messages(100_000)
+
+    with BatchVerifier() as verifier:
+        print(f"Workers: {verifier.workers}")
+        print(f"{'batch':>8} {'seconds':>9} {'verifies/s':>12}")
+        for batch_size in (1, 10, 100, 1_000, 10_000, 100_000):
+            triples = all_triples[:batch_size]
+            rounds = max(1, 10_000 // batch_size)
+            start = time.perf_counter()
+            for _ in range(rounds):
+                bitmap = verifier.verify_batch(triples)
+            elapsed = time.perf_counter() - start
+            assert all(is_valid(bitmap, i) for i in range(batch_size))
+            print(f"{batch_size:>8} {elapsed / rounds:>9.4f} {batch_size * rounds / elapsed:>12,.0f}")
+
+    # Baseline: a fresh VerifyKey per message, as in 05_sign_verify_message.py
+    triples = all_triples[:10_000]
+    start = time.perf_counter()
+    for pubkey, message, signature in triples:
+        nacl.signing.VerifyKey(bytes(pubkey)).verify(message, bytes(signature))
+    elapsed = time.perf_counter() - start
+    print(f"Uncached sequential baseline: {len(triples) / elapsed:,.0f} verifies/s")
+
+def main():
+    triples = make_signed_messages(5, signers=2)
+
+    # Tamper with one message so its signature no longer matches
+    pubkey, _message, signature = triples[3]
+    triples[3] = (pubkey, b"Sign in to evil.com", signature)
+
+    with BatchVerifier() as verifier:
+        bitmap = verifier.verify_batch(triples)
+
+    for i, (pubkey, message, _signature) in enumerate(triples):
+        print(f"{pubkey} {message!r}: valid={is_valid(bitmap, i)}")
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Load Thousands of Signers Lazily from a Keystore
+
+Rebuilding every `Keypair` at startup is slow and memory heavy for a large
+signer fleet. This keystore memory-maps a file of fixed 64-byte keypair
+records together with an index of (pubkey, record number) entries sorted by
+pubkey, the same files `06_bulk_keypair_generator.py` writes. Opening it
+costs the same for ten keys or ten million; a `Keypair` is only built the
+first time its pubkey is used, and an LRU keeps the hot signers alive.
+
+Usage:
+    python 08_mmap_keystore.py                 # builds a demo keystore
+    python 08_mmap_keystore.py fee_payers      # opens fee_payers.bin/.idx
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from solders.keypair import Keypair
+from solders.pubkey import Pubkey
+
+RECORD_SIZE = 64  # 32-byte secret + 32-byte pubkey
+INDEX_ENTRY = struct.Struct("<32sI")  # pubkey, record number
+
+def write_keystore(keypairs, path):
+    """Write `<path>.bin` records and the sorted `<path>.idx` index"""
+    index = []
+    # Raw secret keys: readable by the owner only, whatever the umask
+    records_fd = os.open(path + ".bin", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.fchmod(records_fd, 0o600)
+    with os.fdopen(records_fd, "wb") as records_file:
+        for record_number, keypair in enumerate(keypairs):
+            records_file.write(bytes(keypair))
+            index.append((bytes(keypair.pubkey()), record_number))
+    index.sort()
+    with open(path + ".idx", "wb") as index_file:
+        for pubkey, record_number in index:
+            index_file.write(INDEX_ENTRY.pack(pubkey, record_number))
+
+class Keystore:
+    """Memory-mapped keystore that builds `Keypair` objects on first use"""
+
+    def __init__(self, path, max_live_signers=1_024):
+        self._records_file = open(path + ".bin", "rb")
+        self._index_file = open(path + ".idx", "rb")
+        self.records = mmap.mmap(self._records_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = len(self.index) // INDEX_ENTRY.size
+        self.max_live_signers = max_live_signers
+        self._live = OrderedDict()  # pubkey bytes -> Keypair, least recently used first
+
+    def _record_number(self, pubkey_bytes):
+        # Binary search straight over the mapped index; nothing is loaded up front
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            offset = middle * INDEX_ENTRY.size
+            if self.index[offset:offset + 32] < pubkey_bytes:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            key, record_number = INDEX_ENTRY.unpack_from(self.index, low * INDEX_ENTRY.size)
+            if key == pubkey_bytes:
+                return record_number
+        return None
+
+    def __contains__(self, pubkey):
+        return self._record_number(bytes(pubkey)) is not None
+
+    def __len__(self):
+        return self.count
+
+    def get(self, pubkey):
+        """Return the `Keypair` for `pubkey`, raising KeyError if it is not in the store"""
+        pubkey_bytes = bytes(pubkey)
+        keypair = self._live.get(pubkey_bytes)
+        if keypair is not None:
+            self._live.move_to_end(pubkey_bytes)
+            return keypair
+
+        record_number = self._record_number(pubkey_bytes)
+        if record_number is None:
+            raise KeyError(f"{pubkey} is not in the keystore")
+        offset = record_number * RECORD_SIZE
+        keypair = Keypair.from_bytes(self.records[offset:offset + RECORD_SIZE])
+
+        self._live[pubkey_bytes] = keypair
+        if len(self._live) > self.max_live_signers:
+            self._live.popitem(last=False)
+        return keypair
+
+    def pubkeys(self):
+        """Iterate stored pubkeys in sorted order without building any keypairs"""
+        for offset in range(0, self.count * INDEX_ENTRY.size, INDEX_ENTRY.size):
+            yield Pubkey.from_bytes(self.index[offset:offset + 32])
+
+    def close(self):
+        self._live.clear()
+        self.records.close()
+        self.index.close()
+        self._records_file.close()
+        self._index_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, _exc_type, _exc, _tb):
+        self.close()
+
+def main():
+    if len(sys.argv) > 1:
+        path = sys.argv[1]
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "signers")
+        write_keystore((Keypair() for _ in range(20_000)), path)
+
+    start = time.perf_counter()
+    with Keystore(path) as keystore:
+        opened = time.perf_counter() - start
+        print(f"Opened keystore with {len(keystore)} keys in {opened * 1000:.2f} ms")
+
+        # Pick a signer by pubkey, e.g. the fee payer a request names
+        fee_payer = next(keystore.pubkeys())
+        start = time.perf_counter()
+        signer = keystore.get(fee_payer)
+        first_use = time.perf_counter() - start
+        start = time.perf_counter()
+        keystore.get(fee_payer)
+        cached_use = time.perf_counter() - start
+
+        print(f"Signer: {signer.pubkey()}")
+        print(f"First use: {first_use * 1_000_000:.1f} us, cached: {cached_use * 1_000_000:.1f} us")
+        print(f"Signature: {signer.sign_message(b'Hello, Solana!')}")
+        print(f"Unknown key present: {Keypair().pubkey() in keystore}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Solana Cookbook - How to Validate Public Keys in Bulk
+
+Checks a file (or any iterable) of base58 address strings across a process
+pool and sorts each one into a class: invalid base58, wrong length, on-curve
+(a wallet address) or off-curve (a PDA). Results come back as one compact
+byte per address instead of a Python object per item.
+
+Usage:
+    python 09_bulk_validate_public_keys.py deposit_addresses.txt
+"""
+
+import itertools
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import base58
+from solders.pubkey import Pubkey
+
+# One status byte per address
+INVALID_BASE58 = 0
+WRONG_LENGTH = 1
+ON_CURVE = 2
+OFF_CURVE = 3
+STATUS_NAMES = ["invalid-base58", "wrong-length", "on-curve", "off-curve"]
+
+CHUNK_SIZE = 10_000  # Addresses per worker task
+
+def _classify_chunk(addresses):
+    """Worker: return one status byte per address"""
+    statuses = bytearray(len(addresses))
+    for i, address in enumerate(addresses):
+        try:
+            pubkey = Pubkey.from_string(address)
+        except ValueError:
+            # Rare slow path: work out why the fast parser rejected it
+            try:
+                base58.b58decode(address)
+                statuses[i] = WRONG_LENGTH
+            except ValueError:
+                statuses[i] = INVALID_BASE58
+            continue
+        statuses[i] = ON_CURVE if pubkey.is_on_curve() else OFF_CURVE
+    return bytes(statuses)
+
+def validate_public_keys(addresses, executor=None, max_in_flight=None):
+    """Return a bytearray with one status code per input address, in input order"""
+    addresses = iter(addresses)
+    chunks = iter(lambda: list(itertools.islice(addresses, CHUNK_SIZE)), [])
+    statuses = bytearray()
+
+    if executor is None:
+        for chunk in chunks:
+            statuses += _classify_chunk(chunk)
+        return statuses
+
+    # Keep a bounded number of chunks in flight so huge inputs stream through
+    max_in_flight = max_in_flight or 2 * os.cpu_count()
+    in_flight = deque()
+    for chunk in chunks:
+        in_flight.append(executor.submit(_classify_chunk, chunk))
+        if len(in_flight) >= max_in_flight:
+            statuses += in_flight.popleft().result()
+    while in_flight:
+        statuses += in_flight.popleft().result()
+    return statuses
+
+def count_statuses(statuses):
+    return {name: statuses.count(code) for code, name in enumerate(STATUS_NAMES)}
+
+def main():
+    if len(sys.argv) > 1:
+        # Stream the file; only the status bytes are kept in memory
+        with open(sys.argv[1]) as source, ProcessPoolExecutor() as executor:
+            addresses = (line.strip() for line in source if line.strip())
+            statuses = validate_public_keys(addresses, executor)
+        print(f"Validated {len(statuses)} addresses: {count_statuses(statuses)}")
+        return
+
+    addresses = [
+        "5oNDL3swdJJF1g9DzJiZ4ynHXgszjAEpUkxVYejchzrY",  # on curve
+        "4BJXYkfvg37zEmBbsacZjeQDpTNx91KppxFJxRqrz48e",  # off curve (PDA)
+        "5oNDL3swdJJF1g9DzJiZ4ynHXgszjAEpUkxV",  # valid base58, too short
+        "0OIl-not-base58",  # invalid characters
+    ]
+
+    with ProcessPoolExecutor() as executor:
+        statuses = validate_public_keys(addresses, executor)
+
+    for address, status in zip(addresses, statuses):
+        print(f"{address}: {STATUS_NAMES[status]}")
+    print(f"Totals: {count_statuses(statuses)}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file